@@ -1,4 +1,7 @@
-from flask import Flask, render_template, jsonify, send_from_directory, request, redirect, url_for, flash, session, Response
+import time
+STARTUP_STARTED = time.perf_counter()
+from flask import Flask, render_template, jsonify, send_from_directory, request, redirect, url_for, flash, session, Response, stream_with_context, send_file
+from flask import before_render_template, template_rendered
 from dotenv import load_dotenv
 load_dotenv()
 import os
@@ -6,21 +9,41 @@ import json
 import io
 import re
 import secrets
+import hashlib
+import gzip
 import logging
+import queue
+import threading
+import atexit
+import csv
+import tempfile
+import contextvars
 import click
-from datetime import datetime, timedelta
+from datetime import datetime, date, timedelta
 from werkzeug.security import generate_password_hash, check_password_hash
 from functools import wraps
+from collections import deque, namedtuple
+from concurrent.futures import ThreadPoolExecutor
 from flask_wtf.csrf import CSRFProtect
 from flask_sqlalchemy import SQLAlchemy
-from sqlalchemy import func, extract, text
-import dash
-from dash import dcc, html
-import plotly.express as px
-import pandas as pd
-from openpyxl import Workbook
-from openpyxl.drawing.image import Image
-from openpyxl.styles import Font
+from sqlalchemy import func, text, insert, select, update, delete, or_, tuple_, literal, literal_column, case, bindparam
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.schema import CreateIndex
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+# dash, plotly, pandas and openpyxl are imported inside the functions that use them:
+# together they are most of the import time, and most requests never touch them.
+
+# --- Startup Timing ---
+# Seconds spent in each startup phase (plus lazily built dashboards), shown by `flask startup-report`.
+startup_timings = {}
+
+def record_startup_timing(phase, started):
+    startup_timings[phase] = time.perf_counter() - started
+    logging.info("Startup timing: %s took %.3fs", phase, startup_timings[phase])
+
+record_startup_timing('imports', STARTUP_STARTED)
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 app = Flask(__name__, template_folder=os.path.join(BASE_DIR, 'templates'))
@@ -59,30 +82,113 @@ app.config['PERMANENT_SESSION_LIFETIME'] = timedelta(minutes=30)
 
 # --- Security Helper Functions ---
 
-# In-memory Rate Limiting for Login endpoint
-# SCALABILITY NOTE (Issue #7): This dict is in-memory, per-process.
-# With gunicorn -w 1 (current Procfile) this works correctly.
-# If worker count is increased, each worker gets its own copy of this dict,
-# making the effective limit 10 * num_workers instead of 10.
-# Before scaling workers, move rate-limit state to Redis or the database.
-login_attempts = {}  # ip_address -> list of timestamps
+# Rate Limiting for Login endpoint
+# Uses a sliding-window counter: each key keeps a count for the current and the
+# previous fixed window, and the previous count is weighted by how much of it
+# still overlaps the sliding window. That is two small counters per IP instead of
+# a list of timestamps, and expired windows are deleted as new ones start.
+# The backend is chosen with RATE_LIMIT_BACKEND:
+#   'database' (default) - counters live in the rate_limit_counter table, so the
+#                          limit holds across all gunicorn workers and dynos.
+#   'memory'             - per-process dict, bounded to max_keys IPs. Only correct
+#                          with a single worker (gunicorn -w 1).
+
+class MemoryRateLimiter:
+    """Per-process sliding-window counters, bounded to max_keys entries."""
+
+    def __init__(self, max_keys=10000):
+        self.max_keys = max_keys
+        self.counters = {}  # key -> [window, current_count, previous_count]
+
+    def _counter(self, key, window):
+        counter = self.counters.get(key)
+        if counter is None:
+            return [window, 0, 0]
+        if counter[0] == window:
+            return counter
+        # Roll forward: the old current window becomes the previous one if adjacent
+        return [window, 0, counter[1] if counter[0] == window - 1 else 0]
+
+    def estimate(self, key, period):
+        now = time.time()
+        window = int(now // period)
+        _, current, previous = self._counter(key, window)
+        return previous * (1 - (now % period) / period) + current
+
+    def hit(self, key, period):
+        window = int(time.time() // period)
+        counter = self._counter(key, window)
+        counter[1] += 1
+        self.counters[key] = counter
+        if len(self.counters) > self.max_keys:
+            # Forget IPs with no attempts in the current or previous window first
+            for stale_key in [k for k, c in self.counters.items() if c[0] < window - 1]:
+                del self.counters[stale_key]
+            while len(self.counters) > self.max_keys:
+                self.counters.pop(next(iter(self.counters)))
+
+
+class DatabaseRateLimiter:
+    """Sliding-window counters stored in the rate_limit_counter table."""
+
+    def estimate(self, key, period):
+        now = time.time()
+        window = int(now // period)
+        counts = dict(db.session.query(RateLimitCounter.window_start, RateLimitCounter.count).filter(
+            RateLimitCounter.key == key,
+            RateLimitCounter.period == period,
+            RateLimitCounter.window_start.in_([window - 1, window])
+        ).all())
+        return counts.get(window - 1, 0) * (1 - (now % period) / period) + counts.get(window, 0)
+
+    def hit(self, key, period):
+        window = int(time.time() // period)
+        filters = [
+            RateLimitCounter.key == key,
+            RateLimitCounter.period == period,
+            RateLimitCounter.window_start == window,
+        ]
+        if not RateLimitCounter.query.filter(*filters).update(
+            {'count': RateLimitCounter.count + 1}, synchronize_session=False
+        ):
+            try:
+                with db.session.begin_nested():
+                    db.session.add(RateLimitCounter(key=key, period=period, window_start=window, count=1))
+            except IntegrityError:
+                # Another worker created the row first (the savepoint is already rolled
+                # back); count against its row instead
+                RateLimitCounter.query.filter(*filters).update(
+                    {'count': RateLimitCounter.count + 1}, synchronize_session=False
+                )
+        # Windows older than the previous one no longer affect any estimate
+        RateLimitCounter.query.filter(
+            RateLimitCounter.period == period,
+            RateLimitCounter.window_start < window - 1
+        ).delete(synchronize_session=False)
+        db.session.commit()
+
+
+RATE_LIMIT_BACKENDS = {
+    'memory': MemoryRateLimiter,
+    'database': DatabaseRateLimiter,
+}
+rate_limiter = RATE_LIMIT_BACKENDS[os.environ.get('RATE_LIMIT_BACKEND', 'database')]()
 
 def is_rate_limited(ip_address, limit=10, period=60):
     """Checks if an IP address has exceeded the rate limit (limit requests per period seconds)."""
-    now = datetime.now()
-    timestamps = login_attempts.get(ip_address, [])
-    # Filter timestamps within the period
-    timestamps = [t for t in timestamps if (now - t).total_seconds() < period]
-    login_attempts[ip_address] = timestamps
-    if len(timestamps) >= limit:
-        return True
-    return False
-
-def record_attempt(ip_address):
-    now = datetime.now()
-    if ip_address not in login_attempts:
-        login_attempts[ip_address] = []
-    login_attempts[ip_address].append(now)
+    try:
+        return rate_limiter.estimate(ip_address, period) >= limit
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Rate limiter unavailable: {e}")
+        return False
+
+def record_attempt(ip_address, period=60):
+    try:
+        rate_limiter.hit(ip_address, period)
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Rate limiter unavailable: {e}")
 
 # Password Complexity Policy validator
 def validate_password_complexity(password):
@@ -141,6 +247,138 @@ def internal_server_error(e):
         return jsonify({"error": "An internal server error occurred."}), 500
     return render_template('error.html', error_message="An internal server error occurred. Please try again later or contact support."), 500
 
+# --- Request Performance Instrumentation ---
+
+# Each request records its SQL statement count, DB time, template render time and the
+# remaining Python time. The breakdown is sent as a Server-Timing header (shown in the
+# browser dev tools' network panel) and kept in a rolling window of recent samples per
+# endpoint, summarized on /admin/perf. Samples live in this worker's memory only.
+# Streamed bodies (CSV/XLSX exports) are timed up to the first byte.
+PERF_SAMPLE_SIZE = int(os.environ.get('PERF_SAMPLE_SIZE', 500))
+PERF_HISTOGRAM_BOUNDS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500]
+perf_samples = {}  # endpoint -> deque of (total_ms, db_ms, template_ms, python_ms, queries)
+request_perf = contextvars.ContextVar('request_perf', default=None)
+
+@event.listens_for(Engine, 'before_cursor_execute')
+def _perf_query_started(conn, cursor, statement, parameters, context, executemany):
+    perf = request_perf.get()
+    if perf is not None:
+        perf['query_started'] = time.perf_counter()
+
+@event.listens_for(Engine, 'after_cursor_execute')
+def _perf_query_finished(conn, cursor, statement, parameters, context, executemany):
+    perf = request_perf.get()
+    if perf is not None and 'query_started' in perf:
+        perf['db'] += time.perf_counter() - perf.pop('query_started')
+        perf['queries'] += 1
+
+@before_render_template.connect_via(app)
+def _perf_template_started(sender, template, context, **extra):
+    perf = request_perf.get()
+    if perf is not None:
+        perf['template_started'] = time.perf_counter()
+
+@template_rendered.connect_via(app)
+def _perf_template_finished(sender, template, context, **extra):
+    perf = request_perf.get()
+    if perf is not None and 'template_started' in perf:
+        perf['template'] += time.perf_counter() - perf.pop('template_started')
+
+@app.before_request
+def start_request_timer():
+    request_perf.set({'started': time.perf_counter(), 'db': 0.0, 'template': 0.0, 'queries': 0})
+
+@app.after_request
+def record_request_timing(response):
+    """Adds the Server-Timing header and stores the sample for /admin/perf."""
+    perf = request_perf.get()
+    if perf is None:
+        return response
+    total_ms = (time.perf_counter() - perf['started']) * 1000
+    db_ms = perf['db'] * 1000
+    template_ms = perf['template'] * 1000
+    python_ms = max(total_ms - db_ms - template_ms, 0.0)
+    response.headers['Server-Timing'] = (
+        f'db;dur={db_ms:.1f};desc="{perf["queries"]} queries", tpl;dur={template_ms:.1f}, '
+        f'app;dur={python_ms:.1f}, total;dur={total_ms:.1f}'
+    )
+    endpoint = request.endpoint or 'unmatched'
+    samples = perf_samples.get(endpoint)
+    if samples is None:
+        samples = perf_samples.setdefault(endpoint, deque(maxlen=PERF_SAMPLE_SIZE))
+    samples.append((total_ms, db_ms, template_ms, python_ms, perf['queries']))
+    REQUEST_LATENCY.labels(endpoint, request.method).observe(total_ms / 1000)
+    REQUEST_COUNT.labels(endpoint, request.method, response.status_code).inc()
+    return response
+
+@app.teardown_request
+def clear_request_timer(exc):
+    request_perf.set(None)
+
+# --- Prometheus Metrics ---
+
+# Collectors for /metrics. prometheus_client's multiprocess mode keeps each process's
+# values in small mmap'd files under PROMETHEUS_MULTIPROC_DIR, and /metrics merges
+# the files of every gunicorn worker (and of `flask import-data` runs) at scrape time.
+# The directory has to be known before prometheus_client is imported; gunicorn.conf.py
+# empties it when the server starts and marks exited workers dead.
+METRICS_DIR = os.environ.setdefault('PROMETHEUS_MULTIPROC_DIR', os.path.join(BASE_DIR, 'metrics_store'))
+os.makedirs(METRICS_DIR, exist_ok=True)
+METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+from prometheus_client import Counter, Gauge, Histogram, CollectorRegistry, multiprocess, generate_latest, CONTENT_TYPE_LATEST
+
+REQUEST_LATENCY = Histogram(
+    'tracker_request_duration_seconds', 'Request latency by endpoint.', ['endpoint', 'method']
+)
+REQUEST_COUNT = Counter(
+    'tracker_requests_total', 'Requests by endpoint and status code.', ['endpoint', 'method', 'status']
+)
+LOG_WRITES = Counter('tracker_log_writes_total', 'Work log rows written.', ['source'])
+LOGIN_ATTEMPTS = Counter('tracker_login_attempts_total', 'Login attempts by outcome.', ['outcome'])
+ACCOUNT_LOCKOUTS = Counter('tracker_account_lockouts_total', 'Accounts locked after repeated failed logins.')
+EXPORT_DURATION = Histogram(
+    'tracker_export_duration_seconds', 'Time to build an export file.', ['kind'],
+    buckets=(0.1, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+)
+IMPORT_ROWS = Counter('tracker_import_rows_total', 'Raw Data rows processed by import-data.', ['stage'])
+IMPORT_PROGRESS = Gauge(
+    'tracker_import_progress_ratio', 'Fraction of Raw Data rows read by the running import.',
+    multiprocess_mode='mostrecent'
+)
+IMPORT_LAST_SUCCESS = Gauge(
+    'tracker_import_last_success_timestamp_seconds', 'Unix time the last import-data run finished.',
+    multiprocess_mode='mostrecent'
+)
+
+def perf_summary():
+    """Per-endpoint latency percentiles, time breakdown and histogram over the recent samples."""
+    summary = []
+    for endpoint, samples in list(perf_samples.items()):
+        samples = list(samples)
+        if not samples:
+            continue
+        totals = sorted(sample[0] for sample in samples)
+        count = len(samples)
+        histogram = [0] * (len(PERF_HISTOGRAM_BOUNDS_MS) + 1)
+        for total_ms in totals:
+            histogram[next((i for i, bound in enumerate(PERF_HISTOGRAM_BOUNDS_MS) if total_ms < bound),
+                           len(PERF_HISTOGRAM_BOUNDS_MS))] += 1
+        summary.append({
+            'endpoint': endpoint,
+            'count': count,
+            'p50': totals[(count - 1) // 2],
+            'p95': totals[min(count - 1, int(count * 0.95))],
+            'max': totals[-1],
+            'db': sum(sample[1] for sample in samples) / count,
+            'template': sum(sample[2] for sample in samples) / count,
+            'python': sum(sample[3] for sample in samples) / count,
+            'queries': sum(sample[4] for sample in samples) / count,
+            'histogram': histogram,
+        })
+    # Endpoints that cost the most in total first
+    summary.sort(key=lambda row: row['count'] * (row['db'] + row['template'] + row['python']), reverse=True)
+    return summary
+
 # --- SQLAlchemy Models ---
 
 class User(db.Model):
@@ -177,10 +415,73 @@ class Log(db.Model):
     time = db.Column(db.String(50))
     production_task = db.Column(db.String(100))
     month = db.Column(db.String(50))
+    # Fingerprint of the Raw Data row this log was imported from (NULL for logs entered in the app).
+    # Lets append imports skip rows that are already present.
+    row_hash = db.Column(db.String(40))
+    __table_args__ = (
+        db.Index('ix_log_row_hash', 'row_hash'),
+        # Backs keyset pagination of one employee's logs (newest id first)
+        db.Index('ix_log_team_member_id', 'team_member', 'id'),
+    )
 
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+# Back the tracker's keyset pagination ordered by (date DESC NULLS LAST, id DESC).
+# Postgres needs NULLS LAST spelled out; SQLite rejects it in an index, but its
+# DESC already puts NULLs last.
+for _dialect, _date_order in (('postgresql', Log.date.desc().nulls_last()), ('sqlite', Log.date.desc())):
+    db.Index('ix_log_team_member_date_id', Log.team_member, _date_order, Log.id.desc()).ddl_if(dialect=_dialect)
+    db.Index('ix_log_date_id', _date_order, Log.id.desc()).ddl_if(dialect=_dialect)
+
+class LogDailyRollup(db.Model):
+    """Materialized log counts per (date, team_member, department, function, status).
+
+    Dashboards and reports aggregate this table instead of scanning `log`, so their
+    cost follows the number of distinct days/functions rather than raw log rows.
+    Kept current by employee_update, edit_function and the import command. Every
+    write stamps the rows it touches with change_seq, a number taken from the
+    'log_rollup' counter in cache_version (see next_rollup_change), which /chart-data
+    uses as its write cursor.
+
+    A key whose logs are all gone keeps its row with log_count 0 so the cursor can
+    report the change; readers that list dates, members or functions filter on
+    log_count > 0. These rows are not pruned, since a client holding an older cursor
+    would then miss the removal. There is at most one per key ever written (e.g. a
+    member's 'In Progress' key on each day they closed work), so they grow with the
+    rollup's key space, not with the number of logs.
+    """
+    __tablename__ = 'log_daily_rollup'
+    id = db.Column(db.Integer, primary_key=True)
+    date = db.Column(db.Date, index=True)
+    team_member = db.Column(db.String(80))
+    department = db.Column(db.String(80))
+    function = db.Column(db.String(100))
+    status = db.Column(db.String(100))
+    log_count = db.Column(db.Integer, nullable=False, default=0)
+    # Last time this row was written; max(updated_at) versions the cached dashboard aggregates
+    updated_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Rollup change number of the last write to this row (see next_rollup_change)
+    change_seq = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (
+        db.Index('ix_log_daily_rollup_key', 'date', 'team_member', 'department', 'function', 'status'),
+        db.Index('ix_log_daily_rollup_updated_at', 'updated_at'),
+        db.Index('ix_log_daily_rollup_change_seq', 'change_seq'),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+# One row per rollup key. NULLs never collide in a unique index, so NULL key parts
+# are indexed as sentinels no real value uses.
+db.Index(
+    'uq_log_daily_rollup_key',
+    func.coalesce(LogDailyRollup.date, literal_column("'0001-01-01'")),
+    *[func.coalesce(getattr(LogDailyRollup, column), literal_column("'\x1f'"))
+      for column in ('team_member', 'department', 'function', 'status')],
+    unique=True
+)
+
 class Alert(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     timestamp = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
@@ -189,6 +490,46 @@ class Alert(db.Model):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
 
+class RateLimitCounter(db.Model):
+    """Attempt count for one rate-limit key in one fixed window (see DatabaseRateLimiter)."""
+    __tablename__ = 'rate_limit_counter'
+    id = db.Column(db.Integer, primary_key=True)
+    key = db.Column(db.String(100), nullable=False)
+    period = db.Column(db.Integer, nullable=False)
+    window_start = db.Column(db.Integer, nullable=False, index=True)
+    count = db.Column(db.Integer, nullable=False, default=0)
+    __table_args__ = (
+        db.UniqueConstraint('key', 'period', 'window_start', name='uq_rate_limit_counter_window'),
+    )
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+class ExportJob(db.Model):
+    """A background export (e.g. the daily analytics workbook) and where its file ended up."""
+    __tablename__ = 'export_job'
+    id = db.Column(db.Integer, primary_key=True)
+    kind = db.Column(db.String(50), nullable=False)
+    params = db.Column(db.String(200))
+    status = db.Column(db.String(20), nullable=False, default='queued', index=True)  # queued, running, done, failed
+    requested_by = db.Column(db.String(80))
+    filename = db.Column(db.String(200))
+    error = db.Column(db.String(500))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow, nullable=False)
+    finished_at = db.Column(db.DateTime)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
+class CacheVersion(db.Model):
+    """Write counter for data that processes cache in memory (see catalogue())."""
+    __tablename__ = 'cache_version'
+    name = db.Column(db.String(50), primary_key=True)
+    version = db.Column(db.Integer, nullable=False, default=0)
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+
 class Function(db.Model):
     __tablename__ = 'functions'
     id = db.Column(db.Integer, primary_key=True)
@@ -206,90 +547,477 @@ class Department(db.Model):
         super().__init__(**kwargs)
 
 
-with app.app_context():
+# --- Daily Rollup Maintenance ---
+
+ROLLUP_KEY_COLUMNS = ('date', 'team_member', 'department', 'function', 'status')
+
+def rollup_key(log):
+    """Returns the rollup key tuple for a Log row."""
+    return tuple(getattr(log, column) for column in ROLLUP_KEY_COLUMNS)
+
+# cache_version row counting rollup writes
+ROLLUP_CHANGE_COUNTER = 'log_rollup'
+
+def next_rollup_change():
+    """Takes the next rollup change number in the current transaction.
+
+    The number comes from the database, not a clock: the counter row stays locked
+    until the transaction ends, so numbers become visible in the order they were
+    taken and a reader that has seen number N has seen every write up to N.
+    """
+    return increment_cache_version(ROLLUP_CHANGE_COUNTER)
+
+def adjust_log_rollup(key, delta):
+    """Adds delta to the rollup count for one key. The caller commits, so the rollup
+    changes in the same transaction as the log write. A row that drops to zero is
+    kept, so its change_seq still reports the change to /chart-data."""
+    filters = [getattr(LogDailyRollup, column) == value for column, value in zip(ROLLUP_KEY_COLUMNS, key)]
+    change_seq = next_rollup_change()
+    values = {
+        'log_count': LogDailyRollup.log_count + delta, 'updated_at': datetime.utcnow(), 'change_seq': change_seq
+    }
+    updated = LogDailyRollup.query.filter(*filters).update(values, synchronize_session=False)
+    if not updated and delta > 0:
+        try:
+            with db.session.begin_nested():
+                db.session.add(LogDailyRollup(
+                    log_count=delta, change_seq=change_seq, **dict(zip(ROLLUP_KEY_COLUMNS, key))
+                ))
+        except IntegrityError:
+            # Another worker inserted this key first (uq_log_daily_rollup_key); add to its row
+            LogDailyRollup.query.filter(*filters).update(values, synchronize_session=False)
+
+def add_log_rollup_counts(frame):
+    """Adds a chunk of newly inserted logs (a normalized frame) to the rollup.
+
+    The chunk is counted per rollup key in Python; keys that already have a row are
+    bumped with one executemany UPDATE and the rest inserted with one executemany
+    INSERT, so a chunk costs the same however many logs its dates already hold.
+    The caller commits.
+    """
+    deltas = {}
+    for key in frame[list(ROLLUP_KEY_COLUMNS)].itertuples(index=False, name=None):
+        deltas[key] = deltas.get(key, 0) + 1
+    if not deltas:
+        return
+    key_columns = [getattr(LogDailyRollup, column) for column in ROLLUP_KEY_COLUMNS]
+    dates = {key[0] for key in deltas}
+    known_dates = [d for d in dates if d is not None]
+    date_filter = (or_(LogDailyRollup.date.in_(known_dates), LogDailyRollup.date.is_(None))
+                   if None in dates else LogDailyRollup.date.in_(known_dates))
+    existing = {tuple(row[1:]): row[0] for row in db.session.query(LogDailyRollup.id, *key_columns).filter(date_filter)}
+
+    now = datetime.utcnow()
+    change_seq = next_rollup_change()
+    bumps = [{'rollup_id': existing[key], 'delta': delta} for key, delta in deltas.items() if key in existing]
+    if bumps:
+        db.session.execute(
+            update(LogDailyRollup.__table__).where(LogDailyRollup.id == bindparam('rollup_id')).values(
+                log_count=LogDailyRollup.log_count + bindparam('delta'), updated_at=now, change_seq=change_seq
+            ),
+            bumps
+        )
+    new_keys = [(key, delta) for key, delta in deltas.items() if key not in existing]
+    if new_keys:
+        try:
+            with db.session.begin_nested():
+                db.session.execute(insert(LogDailyRollup.__table__), [
+                    dict(zip(ROLLUP_KEY_COLUMNS, key), log_count=delta, updated_at=now, change_seq=change_seq)
+                    for key, delta in new_keys
+                ])
+        except IntegrityError:
+            # Another worker inserted some of these keys first (uq_log_daily_rollup_key)
+            for key, delta in new_keys:
+                adjust_log_rollup(key, delta)
+
+def rebuild_log_rollup(dates=None, functions=None):
+    """Recomputes rollup rows from `log` with one set-based DELETE and INSERT ... SELECT.
+
+    Rebuilds everything by default, or only the given dates / function names. Keys
+    that no longer have any logs are put back with a zero count, as adjust_log_rollup
+    leaves them. The caller commits.
+    """
+    rollup_filters = []
+    log_filters = []
+    if dates is not None:
+        dates = set(dates)
+        known_dates = [d for d in dates if d is not None]
+        rollup_filters.append(or_(LogDailyRollup.date.in_(known_dates), LogDailyRollup.date.is_(None))
+                              if None in dates else LogDailyRollup.date.in_(known_dates))
+        log_filters.append(or_(Log.date.in_(known_dates), Log.date.is_(None))
+                           if None in dates else Log.date.in_(known_dates))
+    if functions is not None:
+        rollup_filters.append(LogDailyRollup.function.in_(list(functions)))
+        log_filters.append(Log.function.in_(list(functions)))
+
+    rollup_keys = [getattr(LogDailyRollup, column) for column in ROLLUP_KEY_COLUMNS]
+    previous_keys = {tuple(row) for row in db.session.query(*rollup_keys).filter(*rollup_filters)}
+    LogDailyRollup.query.filter(*rollup_filters).delete(synchronize_session=False)
+    now = datetime.utcnow()
+    change_seq = next_rollup_change()
+    key_columns = [getattr(Log, column) for column in ROLLUP_KEY_COLUMNS]
+    source = select(
+        *key_columns, func.count(Log.id), literal(now, db.DateTime), literal(change_seq, db.Integer)
+    ).where(*log_filters).group_by(*key_columns)
+    db.session.execute(insert(LogDailyRollup.__table__).from_select(
+        list(ROLLUP_KEY_COLUMNS) + ['log_count', 'updated_at', 'change_seq'], source
+    ))
+    emptied_keys = previous_keys - {tuple(row) for row in db.session.query(*rollup_keys).filter(*rollup_filters)}
+    if emptied_keys:
+        db.session.execute(insert(LogDailyRollup.__table__), [
+            dict(zip(ROLLUP_KEY_COLUMNS, key), log_count=0, updated_at=now, change_seq=change_seq)
+            for key in emptied_keys
+        ])
+
+
+# --- Schema Migrations ---
+
+# Schema changes are numbered, one-shot steps. `flask migrate` applies the ones newer
+# than the version stored in schema_version (each in its own transaction, together
+# with its version row); worker boot only reads that version. Steps check the live
+# schema before changing it, so they are safe on databases that already have the
+# change, including fresh ones created by the baseline step.
+class SchemaVersion(db.Model):
+    __tablename__ = 'schema_version'
+    version = db.Column(db.Integer, primary_key=True, autoincrement=False)
+    description = db.Column(db.String(200))
+    applied_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+class PendingSchemaStep(db.Model):
+    """A schema change a migration had to skip (e.g. an index the data does not allow
+    yet). `flask migrate` retries only the steps listed here."""
+    __tablename__ = 'pending_schema_step'
+    name = db.Column(db.String(100), primary_key=True)
+    reason = db.Column(db.String(500))
+    recorded_at = db.Column(db.DateTime, default=datetime.utcnow)
+
+def set_schema_step_pending(name, reason=None):
+    """Records (reason given) or clears (reason None) a skipped schema step. The caller commits."""
+    PendingSchemaStep.__table__.create(db.session.connection(), checkfirst=True)
+    PendingSchemaStep.query.filter_by(name=name).delete(synchronize_session=False)
+    if reason is not None:
+        db.session.add(PendingSchemaStep(name=name, reason=reason[:500]))
+
+def table_columns(table):
+    """Returns {column name: column info} for a table as it exists in the database."""
+    return {c['name']: c for c in sa_inspect(db.session.connection()).get_columns(table)}
+
+def add_column_if_missing(table, column, ddl_type):
+    if column not in table_columns(table):
+        quoted_table = db.engine.dialect.identifier_preparer.quote(table)
+        db.session.execute(text(f'ALTER TABLE {quoted_table} ADD COLUMN {column} {ddl_type};'))
+
+def create_model_indexes(model, names):
+    """Creates the named indexes declared on a model if they do not exist yet."""
+    # IF NOT EXISTS rather than checkfirst: reflection does not report expression
+    # indexes. _invoke_with skips indexes declared for another dialect (ddl_if).
+    connection = db.session.connection()
+    for index in model.__table__.indexes:
+        if index.name in names:
+            CreateIndex(index, if_not_exists=True)._invoke_with(connection)
+
+def migrate_baseline():
+    db.create_all()
+
+def migrate_user_lockout_columns():
+    add_column_if_missing('user', 'failed_login_attempts', 'INTEGER DEFAULT 0')
+    add_column_if_missing('user', 'lockout_until', 'TIMESTAMP')
+
+def migrate_log_count_to_integer():
+    # Issue #3: early Postgres databases stored log.count as text
+    if db.engine.dialect.name != 'postgresql':
+        return
+    if not isinstance(table_columns('log')['count']['type'], db.Integer):
+        db.session.execute(text(
+            "ALTER TABLE log ALTER COLUMN count TYPE INTEGER USING "
+            "CASE WHEN count ~ '^[0-9]+$' THEN count::INTEGER ELSE 1 END;"
+        ))
+
+IN_PROGRESS_INDEX = 'uq_log_team_member_in_progress'
+
+def ensure_in_progress_unique_index():
+    """Issue #4: DB-level guard so concurrent requests cannot create two simultaneous
+    'In Progress' logs for the same team_member. Returns False, with a warning naming
+    them, if some team members already have several; the skip is then recorded in
+    pending_schema_step so `flask migrate` retries it. The caller commits."""
+    duplicates = [member for (member,) in db.session.query(Log.team_member).filter(
+        Log.status == 'In Progress'
+    ).group_by(Log.team_member).having(func.count(Log.id) > 1)]
+    if duplicates:
+        reason = f"More than one 'In Progress' log for {', '.join(sorted(duplicates))}"
+        logging.warning(
+            "Not creating %s: %s. Close the extra ones and run `flask migrate` again.", IN_PROGRESS_INDEX, reason
+        )
+        set_schema_step_pending(IN_PROGRESS_INDEX, reason)
+        return False
+    db.session.execute(text(
+        f"CREATE UNIQUE INDEX IF NOT EXISTS {IN_PROGRESS_INDEX} "
+        "ON log (team_member) WHERE status = 'In Progress';"
+    ))
+    set_schema_step_pending(IN_PROGRESS_INDEX, None)
+    return True
+
+def is_in_progress_conflict(error):
+    """True if an IntegrityError came from uq_log_team_member_in_progress. PostgreSQL
+    names the index; SQLite only names the indexed column."""
+    message = str(error.orig)
+    return IN_PROGRESS_INDEX in message or 'UNIQUE constraint failed: log.team_member' in message
+
+def migrate_in_progress_unique_index():
+    ensure_in_progress_unique_index()
+
+def migrate_log_row_hash():
+    add_column_if_missing('log', 'row_hash', 'VARCHAR(40)')
+    create_model_indexes(Log, {'ix_log_row_hash'})
+
+def legacy_log_text(value):
+    """Returns a text field stored by the pre-streaming importer as the streaming
+    importer (_raw_text_column) would read it from the same cell.
+
+    The old importer stored str() of whatever pandas read: '1001.0' for a whole
+    number in a column with blanks, and 'nan' / 'NaN' / 'None' for blank cells.
+    """
+    if value is None:
+        return None
+    text = str(value)
+    if text.strip() == '' or text in ('nan', 'NaN', 'None'):
+        return None
+    if re.fullmatch(r'-?\d+\.0', text):
+        return text[:-2]
+    return text
+
+def migrate_backfill_log_row_hash(batch_size=5000):
+    # Logs imported before row_hash existed get the fingerprint the importer would
+    # give them, numbering repeated rows in id (file) order, so append imports of a
+    # cumulative file skip them. Stored text is read back through legacy_log_text
+    # first, so it hashes like the same cell read by today's importer. Logs entered in
+    # the app keep NULL: the importer always leaves comments and im_escalation_reason
+    # empty, the app form does not.
+    import pandas as pd
+
+    occurrences = RowOccurrences()
+    last_id = 0
+    while True:
+        rows = db.session.query(Log.id, *[getattr(Log, c) for c in LOG_FIELD_COLUMNS]).filter(
+            Log.id > last_id, Log.row_hash.is_(None),
+            Log.comments.is_(None), Log.im_escalation_reason.is_(None)
+        ).order_by(Log.id).limit(batch_size).all()
+        if not rows:
+            break
+        frame = pd.DataFrame([tuple(r) for r in rows], columns=['id'] + LOG_FIELD_COLUMNS, dtype=object)
+        frame = frame.where(frame.notna(), None)
+        for column in RAW_LOG_TEXT_COLUMNS.values():
+            frame[column] = pd.Series([legacy_log_text(v) for v in frame[column]], index=frame.index, dtype=object)
+        hashes = fingerprint_log_rows(frame, occurrences)
+        db.session.execute(update(Log), [
+            {'id': log_id, 'row_hash': row_hash} for log_id, row_hash in zip(frame['id'], hashes)
+        ])
+        last_id = rows[-1].id
+
+def migrate_log_pagination_indexes():
+    create_model_indexes(Log, {'ix_log_team_member_id', 'ix_log_team_member_date_id', 'ix_log_date_id'})
+
+def migrate_rollup_updated_at():
+    add_column_if_missing('log_daily_rollup', 'updated_at', 'TIMESTAMP')
+    create_model_indexes(LogDailyRollup, {'ix_log_daily_rollup_updated_at'})
+
+def prepare_rollup_rebuild():
+    # rebuild_log_rollup stamps rows with a rollup change number, which needs
+    # cache_version and log_daily_rollup.change_seq; databases older than those
+    # migrations reach the rebuild steps first.
+    migrate_cache_version()
+    migrate_rollup_change_seq()
+
+def migrate_build_log_rollup():
+    if not db.session.query(LogDailyRollup.id).first():
+        prepare_rollup_rebuild()
+        rebuild_log_rollup()
+
+def migrate_unique_rollup_key():
+    # Concurrent first writes could leave duplicate rows for one key; rebuilding
+    # merges them before the unique index goes on.
+    prepare_rollup_rebuild()
+    rebuild_log_rollup()
+    create_model_indexes(LogDailyRollup, {'uq_log_daily_rollup_key'})
+
+def migrate_cache_version():
+    CacheVersion.__table__.create(db.session.connection(), checkfirst=True)
+
+def migrate_pending_schema_steps():
+    # Databases migrated before skips were recorded may be missing the In Progress
+    # guard; checking once here records it as pending if it still cannot be created.
+    PendingSchemaStep.__table__.create(db.session.connection(), checkfirst=True)
+    ensure_in_progress_unique_index()
+
+def migrate_rollup_change_seq():
+    add_column_if_missing('log_daily_rollup', 'change_seq', 'INTEGER NOT NULL DEFAULT 0')
+    create_model_indexes(LogDailyRollup, {'ix_log_daily_rollup_change_seq'})
+
+def migrate_sync_departments():
+    # Departments that only appear on logs (from before the Department table) get a row
+    log_depts = {d for (d,) in db.session.query(Log.department).distinct() if d and d.strip()}
+    existing_depts = {d.dept_name for d in Department.query.all()}
+    for dept_name in sorted(log_depts - existing_depts):
+        db.session.add(Department(dept_name=dept_name))
+
+MIGRATIONS = [
+    (1, 'Create tables', migrate_baseline),
+    (2, 'Add user lockout columns', migrate_user_lockout_columns),
+    (3, 'Convert log.count to INTEGER', migrate_log_count_to_integer),
+    (4, 'Unique In Progress log per team member', migrate_in_progress_unique_index),
+    (5, 'Add log.row_hash', migrate_log_row_hash),
+    (6, 'Add log pagination indexes', migrate_log_pagination_indexes),
+    (7, 'Add log_daily_rollup.updated_at', migrate_rollup_updated_at),
+    (8, 'Build daily log rollup', migrate_build_log_rollup),
+    (9, 'Sync departments from logs', migrate_sync_departments),
+    (10, 'Backfill log.row_hash for imported logs', migrate_backfill_log_row_hash),
+    (11, 'Unique daily rollup key', migrate_unique_rollup_key),
+    (12, 'Add cache_version', migrate_cache_version),
+    (13, 'Track skipped schema steps', migrate_pending_schema_steps),
+    (14, 'Add log_daily_rollup.change_seq', migrate_rollup_change_seq),
+]
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+def current_schema_version():
+    """Returns the applied schema version, or 0 if schema_version does not exist yet."""
     try:
-        db.create_all()
-
-        # --- Issue #1: Warn if .env file is present in production ---
-        if os.environ.get('FLASK_ENV') == 'production':
-            env_path = os.path.join(BASE_DIR, '.env')
-            if os.path.exists(env_path):
-                logging.critical(
-                    "SECURITY WARNING: .env file detected inside the deployment folder (%s). "
-                    "This file contains live credentials (DATABASE_URL, SECRET_KEY). "
-                    "Remove it immediately and store secrets via platform environment variables.",
-                    env_path
-                )
+        return db.session.query(func.max(SchemaVersion.version)).scalar() or 0
+    except Exception:
+        db.session.rollback()
+        return 0
+
+# Retries for steps recorded in pending_schema_step, by step name
+PENDING_SCHEMA_STEP_RETRIES = {
+    IN_PROGRESS_INDEX: ensure_in_progress_unique_index,
+}
 
-        # Add columns manually in case the table already exists but doesn't have them
+def apply_migrations():
+    """Applies pending migrations in order, then retries any step an earlier run had
+    to skip (see PendingSchemaStep). On an up-to-date database with nothing pending
+    this costs two queries. Returns the list of versions applied."""
+    schema_version = current_schema_version()
+    applied = []
+    for version, description, migrate in MIGRATIONS:
+        if version <= schema_version:
+            continue
         try:
-            db.session.execute(text('ALTER TABLE "user" ADD COLUMN failed_login_attempts INTEGER DEFAULT 0;'))
+            migrate()
+            SchemaVersion.__table__.create(db.session.connection(), checkfirst=True)
+            db.session.add(SchemaVersion(version=version, description=description))
             db.session.commit()
         except Exception:
             db.session.rollback()
-        try:
-            db.session.execute(text('ALTER TABLE "user" ADD COLUMN lockout_until TIMESTAMP;'))
+            raise
+        applied.append(version)
+        print(f"Applied migration {version}: {description}")
+    for (name,) in db.session.query(PendingSchemaStep.name).all():
+        retry = PENDING_SCHEMA_STEP_RETRIES.get(name)
+        if retry:
+            retry()
             db.session.commit()
-        except Exception:
-            db.session.rollback()
+    return applied
 
-        # --- Issue #3: Migrate count column from String to Integer (Postgres only) ---
-        try:
-            db.session.execute(text(
-                'ALTER TABLE log ALTER COLUMN count TYPE INTEGER USING '
-                'CASE WHEN count ~ \'^\'\'^[0-9]+$\'\' THEN count::INTEGER ELSE 1 END;'
-            ))
-            db.session.commit()
-        except Exception:
-            db.session.rollback()  # Silently ignore on SQLite or if already Integer
+@app.cli.command("migrate")
+def migrate_command():
+    """Applies pending schema migrations."""
+    try:
+        applied = apply_migrations()
+        print(f"Database schema is at version {LATEST_SCHEMA_VERSION}"
+              f"{'' if applied else ' (already up to date)'}.")
+    except Exception as e:
+        print(f"Migration failed, schema left at version {current_schema_version()}: {e}")
+        raise SystemExit(1)
+
+schema_started = time.perf_counter()
+with app.app_context():
+    # --- Issue #1: Warn if .env file is present in production ---
+    if os.environ.get('FLASK_ENV') == 'production':
+        env_path = os.path.join(BASE_DIR, '.env')
+        if os.path.exists(env_path):
+            logging.critical(
+                "SECURITY WARNING: .env file detected inside the deployment folder (%s). "
+                "This file contains live credentials (DATABASE_URL, SECRET_KEY). "
+                "Remove it immediately and store secrets via platform environment variables.",
+                env_path
+            )
+
+    schema_version = current_schema_version()
+    if schema_version < LATEST_SCHEMA_VERSION:
+        logging.warning(
+            "Database schema is at version %s but this code expects %s. Run `flask migrate`.",
+            schema_version, LATEST_SCHEMA_VERSION
+        )
+record_startup_timing('schema version check', schema_started)
 
-        # --- Issue #4: Partial unique index to prevent duplicate 'In Progress' rows ---
-        # This creates a DB-level constraint so even concurrent requests cannot create
-        # two simultaneous 'In Progress' logs for the same team_member.
-        try:
-            db.session.execute(text(
-                "CREATE UNIQUE INDEX IF NOT EXISTS uq_log_team_member_in_progress "
-                "ON log (team_member) WHERE status = 'In Progress';"
-            ))
-            db.session.commit()
-        except Exception:
-            db.session.rollback()  # Silently ignore on DBs that don't support partial indexes
 
-        # Synchronize departments from logs to Department table
+# --- System Alerts ---
+
+# Alerts are written off the request path: add_system_alert only puts the alert on an
+# in-process queue, and a daemon thread inserts queued alerts in batches, then trims
+# the table to the newest ALERT_RETENTION rows with a single set-based DELETE.
+ALERT_RETENTION = 50
+ALERT_BATCH_SIZE = 100
+ALERT_FLUSH_INTERVAL = 1.0  # seconds to wait for more alerts before writing a batch
+alert_queue = queue.Queue(maxsize=10000)
+alert_writer_lock = threading.Lock()
+alert_writer_thread = None
+
+def write_alert_batch(batch):
+    """Inserts a batch of alerts and keeps only the latest ALERT_RETENTION."""
+    with app.app_context():
         try:
-            log_depts = db.session.query(Log.department).distinct().all()
-            log_depts = [d[0] for d in log_depts if d[0] and d[0].strip()]
-            existing_depts = {d.dept_name for d in Department.query.all()}
-            added = False
-            for dept_name in log_depts:
-                if dept_name not in existing_depts:
-                    db.session.add(Department(dept_name=dept_name))
-                    added = True
-            if added:
-                db.session.commit()
+            db.session.execute(insert(Alert.__table__), batch)
+            newest = select(Alert.id).order_by(Alert.timestamp.desc(), Alert.id.desc()).limit(ALERT_RETENTION)
+            db.session.execute(delete(Alert).where(Alert.id.not_in(newest)))
+            db.session.commit()
         except Exception as e:
             db.session.rollback()
-            print(f"Error synchronizing departments at startup: {e}")
-    except Exception as e:
-        print(f"Error checking/updating database schema: {e}")
-
+            print(f"Error managing alerts: {e}")
+
+def _alert_writer_loop():
+    while True:
+        batch = [alert_queue.get()]
+        deadline = time.monotonic() + ALERT_FLUSH_INTERVAL
+        while len(batch) < ALERT_BATCH_SIZE:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(alert_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+        write_alert_batch(batch)
+
+def _ensure_alert_writer():
+    global alert_writer_thread
+    if alert_writer_thread is not None and alert_writer_thread.is_alive():
+        return
+    with alert_writer_lock:
+        if alert_writer_thread is None or not alert_writer_thread.is_alive():
+            alert_writer_thread = threading.Thread(target=_alert_writer_loop, name='alert-writer', daemon=True)
+            alert_writer_thread.start()
 
 def add_system_alert(message):
-    """Adds a system alert to the database and keeps the latest 50."""
-    new_alert = Alert(message=message, timestamp=datetime.now())
-    db.session.add(new_alert)
-
-    # Keep only the last 50 alerts
+    """Queues a system alert for the background writer, which keeps the latest 50."""
     try:
-        alert_count = Alert.query.count()
-        if alert_count > 50:
-            oldest_alerts = Alert.query.order_by(Alert.timestamp.asc()).limit(alert_count - 50).all()
-            for alert in oldest_alerts:
-                db.session.delete(alert)
-        db.session.commit()
-    except Exception as e:
-        db.session.rollback()
-        print(f"Error managing alerts: {e}")
+        alert_queue.put_nowait({'timestamp': datetime.now(), 'message': message[:500]})
+    except queue.Full:
+        app.logger.warning(f"Alert queue full, dropping alert: {message}")
+        return
+    _ensure_alert_writer()
+
+def flush_system_alerts():
+    """Writes any still-queued alerts synchronously (runs at interpreter exit)."""
+    batch = []
+    while True:
+        try:
+            batch.append(alert_queue.get_nowait())
+        except queue.Empty:
+            break
+    if batch:
+        write_alert_batch(batch)
+
+atexit.register(flush_system_alerts)
 
 def login_required(f):
     """Decorator to ensure a user is logged in."""
@@ -315,10 +1043,132 @@ def admin_required(f):
         return f(*args, **kwargs)
     return decorated_function
 
-def init_dashboard(app):
-    """Create a Plotly Dash dashboard."""
+# --- Dashboard Aggregate Cache ---
+
+# Built Dash layouts (aggregate query results plus figures already serialized to
+# plain dicts) are kept per process for up to DASHBOARD_CACHE_TTL seconds. Each entry
+# records the data version it was built from: the latest daily rollup write plus the
+# catalogue version. Every log write, in any process (the import CLI included),
+# moves max(log_daily_rollup.updated_at), so other workers rebuild on their next
+# read; checking costs one index-only lookup. invalidate_dashboard_cache() also
+# clears this process's entries right away.
+DASHBOARD_CACHE_TTL = int(os.environ.get('DASHBOARD_CACHE_TTL', 300))
+dashboard_cache = {}  # cache key -> (expires_at, data version, value)
+
+def dashboard_data_version():
+    """(latest rollup write, catalogue version) - changes whenever cached aggregates may."""
+    return db.session.query(func.max(LogDailyRollup.updated_at)).scalar(), catalogue()['version']
+
+def cached_dashboard_value(key, builder, ttl=None):
+    """Returns the cached value for key, calling builder() to refresh it once expired
+    or once the data it was built from has changed."""
+    now = time.monotonic()
+    version = dashboard_data_version()
+    entry = dashboard_cache.get(key)
+    if entry and entry[0] > now and entry[1] == version:
+        return entry[2]
+    value = builder()
+    # Drop expired entries (e.g. previous days' daily layouts) so the cache stays small
+    for stale_key in [k for k, (expires_at, _, _) in dashboard_cache.items() if expires_at <= now]:
+        dashboard_cache.pop(stale_key, None)
+    dashboard_cache[key] = (now + (DASHBOARD_CACHE_TTL if ttl is None else ttl), version, value)
+    return value
+
+def invalidate_dashboard_cache():
+    """Clears this process's cached dashboard aggregates. Call after any write to Log rows."""
+    dashboard_cache.clear()
+
+# --- Function & Department Catalogue ---
+
+# Nearly every page lists the functions or departments, but those tables only change
+# through the admin functions page, init-db and the importer. catalogue() keeps one
+# snapshot of both in process memory; those writers call invalidate_catalogue(), which
+# bumps the 'catalogue' row of cache_version. Every process compares that version (a
+# primary-key lookup) at most once per CATALOGUE_VERSION_CHECK_INTERVAL seconds and
+# reloads when it moved, so most reads cost no round trip and another process's
+# change shows up within that interval; this process's own changes show up at once.
+# CATALOGUE_TTL bounds staleness if cache_version cannot be read (e.g. before
+# `flask migrate`).
+CATALOGUE_TTL = int(os.environ.get('CATALOGUE_TTL', 300))
+CATALOGUE_VERSION_CHECK_INTERVAL = float(os.environ.get('CATALOGUE_VERSION_CHECK_INTERVAL', 5))
+FunctionEntry = namedtuple('FunctionEntry', ['id', 'name'])
+catalogue_state = {'loaded_version': None, 'expires_at': 0.0, 'checked_until': 0.0, 'snapshot': None}
+catalogue_lock = threading.Lock()
+
+def shared_cache_version(name):
+    """Returns the cache_version counter for name (0 if never bumped), or None if unreadable."""
+    try:
+        return db.session.query(CacheVersion.version).filter_by(name=name).scalar() or 0
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Cache version unavailable: {e}")
+        return None
+
+def increment_cache_version(name):
+    """Increments the cache_version counter for name and returns the new value. The
+    caller commits; until then the counter row stays locked to other writers."""
+    values = {'version': CacheVersion.version + 1}
+    if not CacheVersion.query.filter_by(name=name).update(values, synchronize_session=False):
+        try:
+            with db.session.begin_nested():
+                db.session.add(CacheVersion(name=name, version=1))
+        except IntegrityError:
+            CacheVersion.query.filter_by(name=name).update(values, synchronize_session=False)
+    return db.session.query(CacheVersion.version).filter_by(name=name).scalar()
+
+def bump_shared_cache_version(name):
+    """Increments the cache_version counter for name and commits."""
+    increment_cache_version(name)
+    db.session.commit()
+
+def catalogue():
+    """Returns {'version', 'functions', 'function_names', 'departments'}, functions as
+    FunctionEntry(id, name) and departments as names, both sorted by name."""
+    state = catalogue_state
+    with catalogue_lock:
+        now = time.monotonic()
+        if state['snapshot'] is not None and now < state['checked_until'] and now < state['expires_at']:
+            return state['snapshot']
+    version = shared_cache_version('catalogue')
+    with catalogue_lock:
+        state['checked_until'] = time.monotonic() + CATALOGUE_VERSION_CHECK_INTERVAL
+        if state['loaded_version'] != version or state['expires_at'] <= time.monotonic():
+            functions = [FunctionEntry(f.id, f.name) for f in Function.query.order_by(Function.name).all()]
+            state['snapshot'] = {
+                'version': version,
+                'functions': functions,
+                'function_names': [f.name for f in functions],
+                'departments': [d.dept_name for d in Department.query.order_by(Department.dept_name).all()],
+            }
+            state['loaded_version'] = version
+            state['expires_at'] = time.monotonic() + CATALOGUE_TTL
+        return state['snapshot']
+
+def function_names():
+    return catalogue()['function_names']
+
+def department_names():
+    return catalogue()['departments']
+
+def invalidate_catalogue():
+    """Call after committing any change to the Function or Department tables."""
+    try:
+        bump_shared_cache_version('catalogue')
+    except Exception as e:
+        db.session.rollback()
+        app.logger.error(f"Could not bump the catalogue version: {e}")
+    with catalogue_lock:
+        catalogue_state['expires_at'] = 0.0
+
+def init_dashboard(server):
+    """Create a Plotly Dash dashboard with date-range, department and function filters."""
+    import dash
+    from dash import dcc, html, Input, Output
+    import plotly.express as px
+    import pandas as pd
+
     dash_app = dash.Dash(
-        server=app,
+        server=server,
         routes_pathname_prefix="/admin/analytics/",
         external_stylesheets=[
             "https://stackpath.bootstrapcdn.com/bootstrap/4.3.1/css/bootstrap.min.css"
@@ -326,46 +1176,45 @@ def init_dashboard(app):
         suppress_callback_exceptions=True
     )
 
-    # Protect Dash views
-    for view_func_name, view_func in app.view_functions.items():
-        if view_func_name.startswith(dash_app.config["routes_pathname_prefix"]):
-            app.view_functions[view_func_name] = admin_required(view_func)
-
-    # Create Dash layout
-    def create_layout():
+    def build_figures(start=None, end=None, departments=None, functions=None):
+        """KPIs and figures for one filtered slice of the rollup (start/end inclusive).
+        Returns None when the slice has no logs."""
         # Issue #6: Use SQL aggregations instead of loading all rows into Python.
-        # Check if any data exists at all
-        total_logs = db.session.query(func.count(Log.id)).scalar() or 0
+        # Aggregates read the daily rollup rather than scanning the full log table,
+        # and the date range is applied to its indexed date column.
+        filters = [LogDailyRollup.log_count > 0]
+        if start:
+            filters.append(LogDailyRollup.date >= start)
+        if end:
+            filters.append(LogDailyRollup.date <= end)
+        if departments:
+            filters.append(LogDailyRollup.department.in_(departments))
+        if functions:
+            filters.append(LogDailyRollup.function.in_(functions))
+
+        total_logs = db.session.query(func.sum(LogDailyRollup.log_count)).filter(*filters).scalar() or 0
         if total_logs == 0:
-            return html.Div([
-                html.H1("Analytics Dashboard"),
-                html.P("No data available to display.")
-            ], className="container")
+            return None
 
         # 1. KPI: completion rate via SQL
-        completed_logs = db.session.query(func.count(Log.id)).filter(
-            Log.status.in_(['Completed', 'Approved'])
+        completed_logs = db.session.query(func.sum(LogDailyRollup.log_count)).filter(
+            *filters, LogDailyRollup.status.in_(['Completed', 'Approved'])
         ).scalar() or 0
         completion_rate = (completed_logs / total_logs) * 100 if total_logs > 0 else 0
 
         # Top employee by log count (SQL)
         top_emp_row = db.session.query(
-            Log.team_member, func.count(Log.id).label('cnt')
-        ).group_by(Log.team_member).order_by(func.count(Log.id).desc()).first()
+            LogDailyRollup.team_member, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(*filters).group_by(LogDailyRollup.team_member).order_by(func.sum(LogDailyRollup.log_count).desc()).first()
         top_employee = top_emp_row.team_member if top_emp_row else "N/A"
 
         # 2. Time series: logs per date (SQL GROUP BY)
         time_rows = db.session.query(
-            Log.date, func.count(Log.id).label('cnt')
-        ).filter(Log.date.isnot(None)).group_by(Log.date).order_by(Log.date).all()
+            LogDailyRollup.date, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(*filters, LogDailyRollup.date.isnot(None)).group_by(LogDailyRollup.date).order_by(LogDailyRollup.date).all()
         logs_over_time = pd.DataFrame(
-            [{'date': r.date, 'count': r.cnt} for r in time_rows]
+            [{'date': r.date, 'count': r.cnt} for r in time_rows], columns=['date', 'count']
         )
-        if logs_over_time.empty:
-            return html.Div([
-                html.H1("Analytics Dashboard"),
-                html.P("No data with valid dates available.")
-            ], className="container")
         time_series_fig = px.line(
             logs_over_time, x='date', y='count',
             title='Total Logs Over Time', labels={'date': 'Date', 'count': 'Number of Logs'}
@@ -373,10 +1222,10 @@ def init_dashboard(app):
 
         # 3. Top 10 functions (SQL)
         func_rows = db.session.query(
-            Log.function, func.count(Log.id).label('cnt')
-        ).filter(Log.function.isnot(None)).group_by(Log.function
-        ).order_by(func.count(Log.id).desc()).limit(10).all()
-        func_df = pd.DataFrame([{'function': r.function, 'cnt': r.cnt} for r in func_rows])
+            LogDailyRollup.function, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(*filters, LogDailyRollup.function.isnot(None)).group_by(LogDailyRollup.function
+        ).order_by(func.sum(LogDailyRollup.log_count).desc()).limit(10).all()
+        func_df = pd.DataFrame([{'function': r.function, 'cnt': r.cnt} for r in func_rows], columns=['function', 'cnt'])
         func_df = func_df.sort_values('cnt', ascending=True)
         top_functions_fig = px.bar(
             func_df, x='cnt', y='function', orientation='h',
@@ -385,10 +1234,10 @@ def init_dashboard(app):
 
         # Top 10 employees (SQL)
         emp_rows = db.session.query(
-            Log.team_member, func.count(Log.id).label('cnt')
-        ).filter(Log.team_member.isnot(None)).group_by(Log.team_member
-        ).order_by(func.count(Log.id).desc()).limit(10).all()
-        emp_df = pd.DataFrame([{'team_member': r.team_member, 'cnt': r.cnt} for r in emp_rows])
+            LogDailyRollup.team_member, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(*filters, LogDailyRollup.team_member.isnot(None)).group_by(LogDailyRollup.team_member
+        ).order_by(func.sum(LogDailyRollup.log_count).desc()).limit(10).all()
+        emp_df = pd.DataFrame([{'team_member': r.team_member, 'cnt': r.cnt} for r in emp_rows], columns=['team_member', 'cnt'])
         emp_df = emp_df.sort_values('cnt', ascending=True)
         top_employees_fig = px.bar(
             emp_df, x='cnt', y='team_member', orientation='h',
@@ -397,35 +1246,85 @@ def init_dashboard(app):
 
         # 4. Function distribution donut (SQL)
         all_func_rows = db.session.query(
-            Log.function, func.count(Log.id).label('cnt')
-        ).filter(Log.function.isnot(None)).group_by(Log.function).all()
-        dist_df = pd.DataFrame([{'function': r.function, 'cnt': r.cnt} for r in all_func_rows])
+            LogDailyRollup.function, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(*filters, LogDailyRollup.function.isnot(None)).group_by(LogDailyRollup.function).all()
+        dist_df = pd.DataFrame([{'function': r.function, 'cnt': r.cnt} for r in all_func_rows], columns=['function', 'cnt'])
         function_dist_fig = px.pie(
             dist_df, values='cnt', names='function',
             title='Functions Distribution', hole=0.4
         )
 
+        return {
+            'total_logs': f"{total_logs}",
+            'completion_rate': f"{completion_rate:.2f}%",
+            'top_employee': top_employee,
+            'time_series': time_series_fig.to_dict(),
+            'top_functions': top_functions_fig.to_dict(),
+            'top_employees': top_employees_fig.to_dict(),
+            'function_dist': function_dist_fig.to_dict(),
+        }
+
+    def empty_figure(title):
+        return {'data': [], 'layout': {'title': {'text': title}, 'annotations': [
+            {'text': 'No logs match the selected filters.', 'showarrow': False, 'xref': 'paper', 'yref': 'paper'}
+        ]}}
+
+    # Create Dash layout
+    def create_layout():
+        figures = build_figures()
+        if figures is None:
+            return html.Div([
+                html.H1("Analytics Dashboard"),
+                html.P("No data available to display.")
+            ], className="container")
+
+        first_date, last_date = db.session.query(
+            func.min(LogDailyRollup.date), func.max(LogDailyRollup.date)
+        ).filter(LogDailyRollup.log_count > 0).one()
+        departments = sorted(d for (d,) in db.session.query(LogDailyRollup.department).filter(
+            LogDailyRollup.log_count > 0
+        ).distinct() if d)
+
         layout = html.Div(className="container-fluid", children=[
             html.H1("Analytics Dashboard", className="my-4"),
 
+            # Filters: changing any of them re-queries only the selected slice
+            html.Div(className="row mb-3", children=[
+                html.Div(className="col-md-4", children=[
+                    html.Label("Date Range"),
+                    dcc.DatePickerRange(
+                        id='filter-dates', min_date_allowed=first_date, max_date_allowed=last_date,
+                        start_date=first_date, end_date=last_date, display_format='YYYY-MM-DD'
+                    )
+                ]),
+                html.Div(className="col-md-4", children=[
+                    html.Label("Department"),
+                    dcc.Dropdown(id='filter-departments', options=departments, multi=True, placeholder="All departments")
+                ]),
+                html.Div(className="col-md-4", children=[
+                    html.Label("Function"),
+                    dcc.Dropdown(id='filter-functions', options=report_function_names(), multi=True, placeholder="All functions")
+                ]),
+            ]),
+
             # KPI Cards
             html.Div(className="row", children=[
                 html.Div(className="col-md-4", children=[
                     html.Div(className="card text-white bg-primary mb-3", children=[
                         html.Div(className="card-header", children="Total Logs"),
-                        html.Div(className="card-body", children=[html.H4(f"{total_logs}", className="card-title")])
+                        html.Div(className="card-body", children=[html.H4(figures['total_logs'], id='kpi-total-logs', className="card-title")])
                     ])
                 ]),
                 html.Div(className="col-md-4", children=[
                     html.Div(className="card text-white bg-success mb-3", children=[
                         html.Div(className="card-header", children="Completion Rate"),
-                        html.Div(className="card-body", children=[html.H4(f"{completion_rate:.2f}%", className="card-title")])
+                        html.Div(className="card-body", children=[html.H4(figures['completion_rate'], id='kpi-completion-rate', className="card-title")])
                     ])
                 ]),
                 html.Div(className="col-md-4", children=[
                     html.Div(className="card text-white bg-info mb-3", children=[
                         html.Div(className="card-header", children="Top Employee (by logs)"),
-                        html.Div(className="card-body", children=[html.H4(top_employee, className="card-title")])
+                        html.Div(className="card-body", children=[html.H4(figures['top_employee'], id='kpi-top-employee', className="card-title")])
                     ])
                 ]),
             ]),
@@ -433,37 +1332,73 @@ def init_dashboard(app):
             # Time Series
             html.Div(className="row", children=[
                 html.Div(className="col", children=[
-                    dcc.Graph(figure=time_series_fig)
+                    dcc.Graph(id='graph-time-series', figure=figures['time_series'])
                 ])
             ]),
 
             # Bar Charts
             html.Div(className="row mt-4", children=[
                 html.Div(className="col-md-6", children=[
-                    dcc.Graph(figure=top_functions_fig)
+                    dcc.Graph(id='graph-top-functions', figure=figures['top_functions'])
                 ]),
                 html.Div(className="col-md-6", children=[
-                    dcc.Graph(figure=top_employees_fig)
+                    dcc.Graph(id='graph-top-employees', figure=figures['top_employees'])
                 ])
             ]),
 
             # Donut Chart
             html.Div(className="row mt-4", children=[
                 html.Div(className="col-md-8 offset-md-2", children=[
-                    dcc.Graph(figure=function_dist_fig)
+                    dcc.Graph(id='graph-function-dist', figure=figures['function_dist'])
                 ])
             ])
         ])
         return layout
 
-    dash_app.layout = create_layout
+    @dash_app.callback(
+        Output('kpi-total-logs', 'children'),
+        Output('kpi-completion-rate', 'children'),
+        Output('kpi-top-employee', 'children'),
+        Output('graph-time-series', 'figure'),
+        Output('graph-top-functions', 'figure'),
+        Output('graph-top-employees', 'figure'),
+        Output('graph-function-dist', 'figure'),
+        Input('filter-dates', 'start_date'),
+        Input('filter-dates', 'end_date'),
+        Input('filter-departments', 'value'),
+        Input('filter-functions', 'value'),
+        prevent_initial_call=True
+    )
+    def update_figures(start_date, end_date, departments, functions):
+        # DatePickerRange sends ISO dates, sometimes with a time part
+        start = date.fromisoformat(start_date[:10]) if start_date else None
+        end = date.fromisoformat(end_date[:10]) if end_date else None
+        key = ('analytics_figures', start, end, tuple(sorted(departments or [])), tuple(sorted(functions or [])))
+        with app.app_context():
+            figures = cached_dashboard_value(key, lambda: build_figures(start, end, departments, functions))
+        if figures is None:
+            return ("0", "0.00%", "N/A", empty_figure('Total Logs Over Time'), empty_figure('Top 10 Functions'),
+                    empty_figure('Top 10 Employees by Logs'), empty_figure('Functions Distribution'))
+        return (figures['total_logs'], figures['completion_rate'], figures['top_employee'], figures['time_series'],
+                figures['top_functions'], figures['top_employees'], figures['function_dist'])
+
+    def serve_layout():
+        with app.app_context():
+            return cached_dashboard_value('analytics_layout', create_layout)
+
+    dash_app.layout = serve_layout
 
     return dash_app.server
 
-def init_daily_dashboard(app):
+def init_daily_dashboard(server):
     """Create a Plotly Dash dashboard for Daily Analytics."""
+    import dash
+    from dash import dcc, html
+    import plotly.express as px
+    import pandas as pd
+
     dash_app = dash.Dash(
-        server=app,
+        server=server,
         routes_pathname_prefix="/admin/daily_analytics/",
         external_stylesheets=[
             "https://stackpath.bootstrapcdn.com/bootstrap/4.3.1/css/bootstrap.min.css"
@@ -471,16 +1406,12 @@ def init_daily_dashboard(app):
         suppress_callback_exceptions=True
     )
 
-    # Protect Dash views
-    for view_func_name, view_func in app.view_functions.items():
-        if view_func_name.startswith(dash_app.config["routes_pathname_prefix"]):
-            app.view_functions[view_func_name] = admin_required(view_func)
-
     # Create Dash layout
     def create_layout():
         # Issue #6: Use SQL aggregations instead of loading all rows for the day.
+        # Aggregates read the daily rollup rather than scanning the full log table.
         today = datetime.now().date()
-        total_logs = db.session.query(func.count(Log.id)).filter(Log.date == today).scalar() or 0
+        total_logs = db.session.query(func.sum(LogDailyRollup.log_count)).filter(LogDailyRollup.date == today).scalar() or 0
 
         if total_logs == 0:
             return html.Div([
@@ -489,24 +1420,24 @@ def init_daily_dashboard(app):
             ], className="container")
 
         # KPI: completion rate (SQL)
-        completed_logs = db.session.query(func.count(Log.id)).filter(
-            Log.date == today,
-            Log.status.in_(['Completed', 'Approved'])
+        completed_logs = db.session.query(func.sum(LogDailyRollup.log_count)).filter(
+            LogDailyRollup.date == today,
+            LogDailyRollup.status.in_(['Completed', 'Approved'])
         ).scalar() or 0
         completion_rate = (completed_logs / total_logs) * 100 if total_logs > 0 else 0
 
         # Top employee today (SQL)
         top_emp_row = db.session.query(
-            Log.team_member, func.count(Log.id).label('cnt')
-        ).filter(Log.date == today
-        ).group_by(Log.team_member).order_by(func.count(Log.id).desc()).first()
+            LogDailyRollup.team_member, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(LogDailyRollup.date == today, LogDailyRollup.log_count > 0
+        ).group_by(LogDailyRollup.team_member).order_by(func.sum(LogDailyRollup.log_count).desc()).first()
         top_employee = top_emp_row.team_member if top_emp_row else "N/A"
 
         # Top 10 functions today (SQL)
         func_rows = db.session.query(
-            Log.function, func.count(Log.id).label('cnt')
-        ).filter(Log.date == today, Log.function.isnot(None)
-        ).group_by(Log.function).order_by(func.count(Log.id).desc()).limit(10).all()
+            LogDailyRollup.function, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(LogDailyRollup.date == today, LogDailyRollup.log_count > 0, LogDailyRollup.function.isnot(None)
+        ).group_by(LogDailyRollup.function).order_by(func.sum(LogDailyRollup.log_count).desc()).limit(10).all()
         func_df = pd.DataFrame([{'function': r.function, 'cnt': r.cnt} for r in func_rows])
         func_df = func_df.sort_values('cnt', ascending=True)
         top_functions_fig = px.bar(
@@ -516,9 +1447,9 @@ def init_daily_dashboard(app):
 
         # Top 10 employees today (SQL)
         emp_rows = db.session.query(
-            Log.team_member, func.count(Log.id).label('cnt')
-        ).filter(Log.date == today, Log.team_member.isnot(None)
-        ).group_by(Log.team_member).order_by(func.count(Log.id).desc()).limit(10).all()
+            LogDailyRollup.team_member, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(LogDailyRollup.date == today, LogDailyRollup.log_count > 0, LogDailyRollup.team_member.isnot(None)
+        ).group_by(LogDailyRollup.team_member).order_by(func.sum(LogDailyRollup.log_count).desc()).limit(10).all()
         emp_df = pd.DataFrame([{'team_member': r.team_member, 'cnt': r.cnt} for r in emp_rows])
         emp_df = emp_df.sort_values('cnt', ascending=True)
         top_employees_fig = px.bar(
@@ -528,8 +1459,8 @@ def init_daily_dashboard(app):
 
         # Function distribution today (SQL)
         all_func_rows = db.session.query(
-            Log.function, func.count(Log.id).label('cnt')
-        ).filter(Log.date == today, Log.function.isnot(None)).group_by(Log.function).all()
+            LogDailyRollup.function, func.sum(LogDailyRollup.log_count).label('cnt')
+        ).filter(LogDailyRollup.date == today, LogDailyRollup.log_count > 0, LogDailyRollup.function.isnot(None)).group_by(LogDailyRollup.function).all()
         dist_df = pd.DataFrame([{'function': r.function, 'cnt': r.cnt} for r in all_func_rows])
         function_dist_fig = px.pie(
             dist_df, values='cnt', names='function',
@@ -575,36 +1506,95 @@ def init_daily_dashboard(app):
             # Bar Charts
             html.Div(className="row mt-4", children=[
                 html.Div(className="col-md-6", children=[
-                    dcc.Graph(figure=top_functions_fig)
+                    dcc.Graph(figure=top_functions_fig.to_dict())
                 ]),
                 html.Div(className="col-md-6", children=[
-                    dcc.Graph(figure=top_employees_fig)
+                    dcc.Graph(figure=top_employees_fig.to_dict())
                 ])
             ]),
 
             # Donut Chart
             html.Div(className="row mt-4", children=[
                 html.Div(className="col-md-8 offset-md-2", children=[
-                    dcc.Graph(figure=function_dist_fig)
+                    dcc.Graph(figure=function_dist_fig.to_dict())
                 ])
             ])
         ])
         return layout
 
-    dash_app.layout = create_layout
+    def serve_layout():
+        with app.app_context():
+            return cached_dashboard_value(('daily_analytics_layout', datetime.now().date()), create_layout)
+
+    dash_app.layout = serve_layout
 
     return dash_app.server
 
-@app.route('/admin/daily_analytics/export')
-@admin_required
-def export_daily_analytics():
-    """Exports the daily analytics dashboard to a formatted Excel file."""
-    today = datetime.now().date()
+# --- Rendered Chart Image Cache ---
+
+# PNGs rendered by kaleido are stored on disk under a hash of the aggregated series
+# they plot, so re-exporting unchanged data skips rendering entirely. The directory
+# is trimmed to CHART_CACHE_MAX_BYTES by evicting the least recently used images.
+CHART_CACHE_DIR = os.path.join(BASE_DIR, 'chart_cache')
+CHART_CACHE_MAX_BYTES = int(os.environ.get('CHART_CACHE_MAX_BYTES', 50 * 1024 * 1024))
+
+def chart_cache_key(name, series, width, height):
+    """Hashes a chart's identity and the (label, value) pairs it plots."""
+    payload = json.dumps(
+        {'name': name, 'series': [[str(label), int(value)] for label, value in series], 'size': [width, height]},
+        sort_keys=True
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+def evict_chart_cache():
+    """Removes least recently used images until the cache fits CHART_CACHE_MAX_BYTES."""
+    try:
+        entries = [entry for entry in os.scandir(CHART_CACHE_DIR) if entry.name.endswith('.png')]
+    except FileNotFoundError:
+        return
+    entries = sorted(((entry.stat().st_mtime, entry.stat().st_size, entry.path) for entry in entries), reverse=True)
+    total = 0
+    for _, size, path in entries:
+        total += size
+        if total > CHART_CACHE_MAX_BYTES:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+def cached_figure_image(name, series, build_figure, width, height):
+    """Returns PNG bytes for a chart, rendering with build_figure() only on a cache miss."""
+    path = os.path.join(CHART_CACHE_DIR, f"{chart_cache_key(name, series, width, height)}.png")
+    try:
+        with open(path, 'rb') as f:
+            image = f.read()
+        os.utime(path)  # mark as recently used
+        return image
+    except OSError:
+        pass
+
+    image = build_figure().to_image(format="png", width=width, height=height)
+    os.makedirs(CHART_CACHE_DIR, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(image)
+    os.replace(tmp_path, path)
+    evict_chart_cache()
+    return image
+
+def build_daily_analytics_export(day_str):
+    """Builds the daily analytics Excel report for one day. Returns (filename, bytes)."""
+    import pandas as pd
+    import plotly.express as px
+    from openpyxl import Workbook
+    from openpyxl.drawing.image import Image
+    from openpyxl.styles import Font
+
+    today = datetime.strptime(day_str, '%Y-%m-%d').date()
     logs = Log.query.filter(Log.date == today).all()
 
     if not logs:
-        flash('No data available for today to export.', 'warning')
-        return redirect('/admin/daily_analytics/')
+        raise ValueError(f"No data available for {day_str} to export.")
 
     df = pd.DataFrame([
         {"team_member": log.team_member, "function": log.function, "date": log.date, "status": log.status}
@@ -612,8 +1602,7 @@ def export_daily_analytics():
     ])
 
     if df.empty:
-        flash('No data available to display.', 'warning')
-        return redirect('/admin/daily_analytics/')
+        raise ValueError(f"No data available for {day_str} to export.")
 
     # --- 1. Calculate KPIs ---
     total_logs = len(df)
@@ -622,20 +1611,27 @@ def export_daily_analytics():
     top_employee_series = df['team_member'].mode()
     top_employee = top_employee_series[0] if not top_employee_series.empty else "N/A"
 
-    # --- 2. Generate Figures ---
+    # --- 2. Aggregate Series ---
     top_functions = df['function'].value_counts().nlargest(10).sort_values(ascending=True)
-    top_functions_fig = px.bar(top_functions, x=top_functions.values, y=top_functions.index, orientation='h', title='Top 10 Functions Today', labels={'x': 'Count', 'y': 'Function'})
-
     top_employees = df['team_member'].value_counts().nlargest(10).sort_values(ascending=True)
-    top_employees_fig = px.bar(top_employees, x=top_employees.values, y=top_employees.index, orientation='h', title='Top 10 Employees Today', labels={'x': 'Count', 'y': 'Employee'})
-
     function_dist = df['function'].value_counts()
-    function_dist_fig = px.pie(function_dist, values=function_dist.values, names=function_dist.index, title='Functions Distribution Today', hole=0.4)
 
-    # --- 3. Save Figures to Image Bytes ---
-    img_top_funcs = top_functions_fig.to_image(format="png", width=600, height=400)
-    img_top_emps = top_employees_fig.to_image(format="png", width=600, height=400)
-    img_func_dist = function_dist_fig.to_image(format="png", width=800, height=500)
+    # --- 3. Render Figures to Image Bytes (cached by series) ---
+    img_top_funcs = cached_figure_image(
+        'daily_top_functions', top_functions.items(),
+        lambda: px.bar(top_functions, x=top_functions.values, y=top_functions.index, orientation='h', title='Top 10 Functions Today', labels={'x': 'Count', 'y': 'Function'}),
+        width=600, height=400
+    )
+    img_top_emps = cached_figure_image(
+        'daily_top_employees', top_employees.items(),
+        lambda: px.bar(top_employees, x=top_employees.values, y=top_employees.index, orientation='h', title='Top 10 Employees Today', labels={'x': 'Count', 'y': 'Employee'}),
+        width=600, height=400
+    )
+    img_func_dist = cached_figure_image(
+        'daily_function_distribution', function_dist.items(),
+        lambda: px.pie(function_dist, values=function_dist.values, names=function_dist.index, title='Functions Distribution Today', hole=0.4),
+        width=800, height=500
+    )
 
     # --- 4. Create and Format Excel File in Memory ---
     output = io.BytesIO()
@@ -667,15 +1663,140 @@ def export_daily_analytics():
     ws.add_image(Image(io.BytesIO(img_func_dist)), 'A35')
 
     workbook.save(output)
-    output.seek(0)
 
-    # --- 5. Serve the file ---
     filename = f"Daily_Analytics_{today.strftime('%Y-%m-%d')}.xlsx"
-    return Response(
-        output,
-        mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment;filename={filename}"}
-    )
+    return filename, output.getvalue()
+
+# --- Background Export Jobs ---
+
+# Chart-rendering exports run through kaleido, which takes seconds per figure. They
+# run on a small thread pool so the (single) gunicorn worker keeps serving requests;
+# the job row in the database tracks progress and the finished file lives in EXPORT_DIR.
+EXPORT_DIR = os.path.join(BASE_DIR, 'exports')
+EXPORT_JOB_RETENTION = timedelta(days=1)
+EXPORT_JOB_TIMEOUT = timedelta(minutes=10)
+EXPORT_JOB_BUILDERS = {
+    'daily_analytics': build_daily_analytics_export,
+}
+export_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get('EXPORT_WORKERS', 1)), thread_name_prefix='export'
+)
+# Ids of jobs submitted to this process's pool and not finished yet. Queued/running rows
+# not in here belong to another worker, or to one that restarted and lost them.
+export_jobs_in_process = set()
+
+def export_job_path(job):
+    return os.path.join(EXPORT_DIR, f"{job.id}_{job.filename}")
+
+def run_export_job(job_id):
+    """Executes a queued export job in a pool thread and records the outcome."""
+    with app.app_context():
+        job = db.session.get(ExportJob, job_id)
+        job.status = 'running'
+        db.session.commit()
+        try:
+            with EXPORT_DURATION.labels(job.kind).time():
+                filename, content = EXPORT_JOB_BUILDERS[job.kind](job.params)
+            job.filename = filename
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            with open(export_job_path(job), 'wb') as f:
+                f.write(content)
+            job.status = 'done'
+        except Exception as e:
+            db.session.rollback()
+            app.logger.error(f"Export job {job_id} failed: {e}", exc_info=True)
+            job = db.session.get(ExportJob, job_id)
+            job.status = 'failed'
+            job.error = str(e)[:500]
+        job.finished_at = datetime.now()
+        db.session.commit()
+        export_jobs_in_process.discard(job_id)
+
+def fail_stale_export_jobs():
+    """Marks jobs still queued/running after EXPORT_JOB_TIMEOUT as failed, e.g. ones
+    whose worker restarted mid-export, so their status page stops waiting."""
+    ExportJob.query.filter(
+        ExportJob.status.in_(['queued', 'running']),
+        ExportJob.created_at < datetime.now() - EXPORT_JOB_TIMEOUT
+    ).update({
+        'status': 'failed',
+        'error': f"Export did not finish within {int(EXPORT_JOB_TIMEOUT.total_seconds() // 60)} minutes.",
+        'finished_at': datetime.now(),
+    }, synchronize_session=False)
+    db.session.commit()
+
+def purge_export_jobs():
+    """Fails stale jobs, then deletes finished jobs older than EXPORT_JOB_RETENTION
+    along with their files."""
+    fail_stale_export_jobs()
+    cutoff = datetime.now() - EXPORT_JOB_RETENTION
+    for job in ExportJob.query.filter(ExportJob.created_at < cutoff, ExportJob.status.in_(['done', 'failed'])).all():
+        if job.filename:
+            try:
+                os.remove(export_job_path(job))
+            except OSError:
+                pass
+        db.session.delete(job)
+    db.session.commit()
+
+def enqueue_export_job(kind, params):
+    """Queues an export, reusing a queued/running job for the same kind and params
+    that this process's pool is still working on."""
+    purge_export_jobs()
+    job = ExportJob.query.filter(
+        ExportJob.kind == kind,
+        ExportJob.params == params,
+        ExportJob.status.in_(['queued', 'running']),
+        ExportJob.id.in_(list(export_jobs_in_process))
+    ).first()
+    if job:
+        return job
+    job = ExportJob(kind=kind, params=params, status='queued', requested_by=session.get('user'), created_at=datetime.now())
+    db.session.add(job)
+    db.session.commit()
+    export_jobs_in_process.add(job.id)
+    export_executor.submit(run_export_job, job.id)
+    return job
+
+@app.route('/admin/daily_analytics/export')
+@admin_required
+def export_daily_analytics():
+    """Queues an Excel export of the daily analytics dashboard and shows its progress page."""
+    today = datetime.now().date()
+    if not db.session.query(LogDailyRollup.id).filter(LogDailyRollup.date == today, LogDailyRollup.log_count > 0).first():
+        flash('No data available for today to export.', 'warning')
+        return redirect('/admin/daily_analytics/')
+
+    job = enqueue_export_job('daily_analytics', today.strftime('%Y-%m-%d'))
+    return redirect(url_for('export_job_status', job_id=job.id))
+
+@app.route('/admin/exports/<int:job_id>')
+@admin_required
+def export_job_status(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    return render_template('admin/export_job.html', job=job)
+
+@app.route('/admin/exports/<int:job_id>/status')
+@admin_required
+def export_job_status_json(job_id):
+    fail_stale_export_jobs()
+    job = ExportJob.query.get_or_404(job_id)
+    return jsonify({
+        'id': job.id,
+        'kind': job.kind,
+        'status': job.status,
+        'error': job.error,
+        'download_url': url_for('download_export_job', job_id=job.id) if job.status == 'done' else None,
+    })
+
+@app.route('/admin/exports/<int:job_id>/download')
+@admin_required
+def download_export_job(job_id):
+    job = ExportJob.query.get_or_404(job_id)
+    if job.status != 'done' or not os.path.exists(export_job_path(job)):
+        flash('This export is not ready or has expired.', 'warning')
+        return redirect(url_for('export_job_status', job_id=job.id))
+    return send_file(export_job_path(job), as_attachment=True, download_name=job.filename)
 
 @app.route('/')
 def landing():
@@ -698,6 +1819,7 @@ def login():
         # 1. IP-level Rate Limiting
         client_ip = request.headers.get('X-Forwarded-For', request.remote_addr).split(',')[0].strip()
         if is_rate_limited(client_ip, limit=10, period=60):
+            LOGIN_ATTEMPTS.labels('rate_limited').inc()
             flash('Too many login attempts. Please try again in a minute.', 'danger')
             try:
                 add_system_alert(f"Rate limit exceeded on login endpoint from IP: {client_ip}")
@@ -715,6 +1837,7 @@ def login():
         if user:
             # 2. Account Lockout Check
             if user.lockout_until and user.lockout_until > datetime.now():
+                LOGIN_ATTEMPTS.labels('locked').inc()
                 lockout_left = int((user.lockout_until - datetime.now()).total_seconds() / 60) + 1
                 flash(f"Account is temporarily locked. Try again in {lockout_left} minutes.", 'danger')
                 try:
@@ -729,6 +1852,7 @@ def login():
                 user.failed_login_attempts = 0
                 user.lockout_until = None
                 db.session.commit()
+                LOGIN_ATTEMPTS.labels('success').inc()
 
                 # Enable session expiry timeout (starts permanent timer of 30 mins)
                 session.permanent = True
@@ -749,8 +1873,10 @@ def login():
                     return redirect(url_for('employee_dashboard'))
             else:
                 # Increment failed login count
+                LOGIN_ATTEMPTS.labels('failure').inc()
                 user.failed_login_attempts = (user.failed_login_attempts or 0) + 1
                 if user.failed_login_attempts >= 5:
+                    ACCOUNT_LOCKOUTS.inc()
                     user.lockout_until = datetime.now() + timedelta(minutes=15)
                     flash('Invalid username or password. Your account has been locked for 15 minutes.', 'danger')
                     try:
@@ -768,6 +1894,7 @@ def login():
                     pass
                 return redirect(url_for('login'))
         else:
+            LOGIN_ATTEMPTS.labels('failure').inc()
             # Prevent username timing attack using dummy verification
             check_password_hash(generate_password_hash('dummy_pass'), password)
             flash('Invalid username or password.', 'danger')
@@ -791,6 +1918,23 @@ def logout():
         session.clear()
     return redirect(url_for('login'))
 
+WORK_LOG_PAGE_SIZE = 50
+
+def fetch_work_log_page(team_member, before_id=None, limit=WORK_LOG_PAGE_SIZE):
+    """Keyset page of a team member's logs, newest first.
+
+    Seeks on (team_member, id) instead of using OFFSET, so every page costs the same
+    no matter how much history the employee has. Returns (logs, next_cursor), where
+    next_cursor is the id to pass as before_id for the following page, or None.
+    """
+    query = Log.query.filter(Log.team_member == team_member)
+    if before_id is not None:
+        query = query.filter(Log.id < before_id)
+    logs = query.order_by(Log.id.desc()).limit(limit + 1).all()
+    if len(logs) > limit:
+        return logs[:limit], logs[limit - 1].id
+    return logs, None
+
 @app.route('/employee/update', methods=['GET', 'POST'])
 @login_required
 def employee_update():
@@ -844,14 +1988,14 @@ def employee_update():
                 db.session.add(new_log)
                 # Issue #4: Use a savepoint so a unique-index violation from a
                 # concurrent duplicate request is caught cleanly without corrupting
-                # the outer session transaction.
+                # the outer session transaction. Any other error goes to the
+                # generic handler below.
                 try:
-                    sp = db.session.begin_nested()
-                    db.session.flush()
-                    sp.commit()
-                    db.session.commit()
-                    flash('Work log added successfully!', 'success')
-                except Exception:
+                    with db.session.begin_nested():
+                        db.session.flush()
+                except IntegrityError as e:
+                    if not is_in_progress_conflict(e):
+                        raise
                     db.session.rollback()
                     flash(
                         "A duplicate 'In Progress' entry was detected and blocked. "
@@ -859,6 +2003,11 @@ def employee_update():
                         'danger'
                     )
                     return redirect(url_for('employee_update'))
+                adjust_log_rollup(rollup_key(new_log), 1)
+                db.session.commit()
+                invalidate_dashboard_cache()
+                LOG_WRITES.labels('employee_update').inc()
+                flash('Work log added successfully!', 'success')
 
             # Handle status updates for existing 'In Progress' files
             else:  # file_number exists and status is not 'In Progress'
@@ -869,6 +2018,7 @@ def employee_update():
                 ).first()
 
                 if log_to_update:
+                    old_rollup_key = rollup_key(log_to_update)
                     month_str = log_date.strftime('%b-%y') if log_date else None
                     log_to_update.status = status
                     log_to_update.date = log_date
@@ -879,7 +2029,12 @@ def employee_update():
                     log_to_update.bucket = request.form.get('function')
                     log_to_update.production_task = request.form.get('production_task')
                     log_to_update.month = month_str
+                    if rollup_key(log_to_update) != old_rollup_key:
+                        adjust_log_rollup(old_rollup_key, -1)
+                        adjust_log_rollup(rollup_key(log_to_update), 1)
                     db.session.commit()
+                    invalidate_dashboard_cache()
+                    LOG_WRITES.labels('employee_update').inc()
                     flash(f"Work log for file '{file_number}' updated to '{status}'.", 'success')
                 else:
                     flash(
@@ -893,22 +2048,82 @@ def employee_update():
             flash(f'Error saving data: {str(e)}', 'danger')
         return redirect(url_for('employee_update'))
 
-    # Fetch logs for the current user
-    logs = Log.query.filter_by(
-        team_member=session.get('user', 'Guest')
-    ).order_by(
-        Log.id.desc()
-    ).all()
+    # Fetch the first page of logs for the current user; the page loads older ones on scroll
+    logs, next_cursor = fetch_work_log_page(session.get('user', 'Guest'))
+
+    functions = function_names()
 
-    functions = [f.name for f in Function.query.order_by(Function.name).all()]
+    return render_template('employee/update_work.html', employee_name=session.get('user', 'Guest'), logs=logs, next_cursor=next_cursor, user_department=user_department, functions=functions)
 
-    return render_template('employee/update_work.html', employee_name=session.get('user', 'Guest'), logs=logs, user_department=user_department, functions=functions)
+@app.route('/employee/update/logs')
+@login_required
+def employee_update_logs():
+    """Returns the next page of the current user's logs, older than the `before` log id."""
+    before = request.args.get('before', type=int)
+    logs, next_cursor = fetch_work_log_page(session.get('user', 'Guest'), before_id=before)
+    return jsonify({
+        'logs': [{
+            'date': log.date.strftime('%Y-%m-%d') if log.date else '',
+            'team_member': log.team_member,
+            'function': log.function,
+            'file_number': log.file_number,
+            'status': log.status,
+            'department': log.department,
+            'production_task': log.production_task,
+            'comments': log.comments,
+        } for log in logs],
+        'next_cursor': next_cursor,
+    })
 
 @app.route('/employee/dashboard')
 @login_required
 def employee_dashboard():
     return render_template('employee/dashboard.html')
 
+# --- Function Summary ---
+
+def month_key(column):
+    """SQL expression turning a date column into its 'YYYY-MM' month."""
+    if db.engine.dialect.name == 'postgresql':
+        return func.to_char(column, 'YYYY-MM')
+    return func.strftime('%Y-%m', column)
+
+def function_summary(team_member=None, start=None, end=None, by_month=False):
+    """Log counts per catalogue function from grouped queries over the daily rollup.
+
+    Optionally limited to one team member and to start <= date <= end. Returns
+    (summary_counts, monthly): summary_counts maps every function to its total, and
+    monthly maps 'YYYY-MM' to per-function counts (oldest month first) when by_month
+    is set, else None. Cost follows the number of days and functions, not of logs.
+    """
+    filters = [LogDailyRollup.function.isnot(None), LogDailyRollup.log_count > 0]
+    if team_member is not None:
+        filters.append(LogDailyRollup.team_member == team_member)
+    if start:
+        filters.append(LogDailyRollup.date >= start)
+    if end:
+        filters.append(LogDailyRollup.date <= end)
+
+    summary_counts = {name: 0 for name in function_names()}
+    rows = db.session.query(
+        LogDailyRollup.function, func.sum(LogDailyRollup.log_count)
+    ).filter(*filters).group_by(LogDailyRollup.function).all()
+    for function, count in rows:
+        if function in summary_counts:
+            summary_counts[function] = count
+
+    monthly = None
+    if by_month:
+        month = month_key(LogDailyRollup.date)
+        month_rows = db.session.query(
+            month, LogDailyRollup.function, func.sum(LogDailyRollup.log_count)
+        ).filter(*filters, LogDailyRollup.date.isnot(None)).group_by(month, LogDailyRollup.function).order_by(month).all()
+        monthly = {}
+        for month_value, function, count in month_rows:
+            if function in summary_counts:
+                monthly.setdefault(month_value, {})[function] = count
+    return summary_counts, monthly
+
 @app.route('/employee/summary')
 @login_required
 def employee_summary():
@@ -919,33 +2134,22 @@ def employee_summary():
             return redirect(url_for('admin_dashboard'))
         return redirect(url_for('login'))
 
-    logs = Log.query.filter_by(team_member=session.get('user')).all()
+    start, end = parse_date_param('start'), parse_date_param('end')
+    by_month = request.args.get('by_month') == '1'
+    summary_counts, monthly = function_summary(session.get('user'), start, end, by_month)
 
-    all_functions = [f.name for f in Function.query.order_by(Function.name).all()]
-    summary_counts = {func: 0 for func in all_functions}
-    for log in logs:
-        function = log.function
-        if function in summary_counts:
-            summary_counts[function] += 1
-    
     functions = sorted(summary_counts.keys())
 
     return render_template('employee/summary.html', 
                            summary_counts=summary_counts, 
                            functions=functions, 
-                           employee_name=session.get('user'))
+                           employee_name=session.get('user'),
+                           monthly=monthly, start=start, end=end, by_month=by_month)
 
 @app.route('/admin/summary')
 @admin_required
 def admin_summary():
-    # Using a more efficient query
-    summary_counts_query = db.session.query(Log.function, func.count(Log.function)).group_by(Log.function).all()
-    
-    all_functions = [f.name for f in Function.query.order_by(Function.name).all()]
-    summary_counts = {func: 0 for func in all_functions}
-    for function, count in summary_counts_query:
-        if function in summary_counts:
-            summary_counts[function] = count
+    summary_counts, _ = function_summary()
     
     functions = sorted(summary_counts.keys())
 
@@ -970,15 +2174,16 @@ def manage_functions():
             new_function = Function(name=function_name)
             db.session.add(new_function)
             db.session.commit()
+            invalidate_catalogue()
+            invalidate_dashboard_cache()
             add_system_alert(f"Admin {session.get('user')} created function: {function_name}")
             flash(f'Function "{function_name}" created successfully.', 'success')
         return redirect(url_for('manage_functions'))
 
-    functions = Function.query.order_by(Function.name).all()
+    functions = catalogue()['functions']
     
     # Get department names from the Department table
-    departments_query = Department.query.order_by(Department.dept_name).all()
-    departments = [d.dept_name for d in departments_query if d.dept_name and d.dept_name.strip()]
+    departments = [d for d in department_names() if d and d.strip()]
     return render_template('admin/functions.html', functions=functions, departments=departments)
 
 @app.route('/admin/functions/edit/<int:id>', methods=['POST'])
@@ -996,8 +2201,11 @@ def edit_function(id):
         else:
             old_name = function_to_edit.name
             Log.query.filter_by(function=old_name).update({'function': new_name})
+            rebuild_log_rollup(functions=[old_name, new_name])
             function_to_edit.name = new_name
             db.session.commit()
+            invalidate_catalogue()
+            invalidate_dashboard_cache()
             add_system_alert(f"Admin {session.get('user')} edited function from '{old_name}' to '{new_name}'")
             flash(f'Function updated from "{old_name}" to "{new_name}".', 'success')
     return redirect(url_for('manage_functions'))
@@ -1012,6 +2220,8 @@ def delete_function(id):
         func_name = function_to_delete.name
         db.session.delete(function_to_delete)
         db.session.commit()
+        invalidate_catalogue()
+        invalidate_dashboard_cache()
         add_system_alert(f"Admin {session.get('user')} deleted function: {func_name}")
         flash(f'Function "{func_name}" has been deleted.', 'success')
     return redirect(url_for('manage_functions'))
@@ -1062,22 +2272,71 @@ def create_employee():
         flash(f'Employee "{username}" created successfully!', 'success')
         return redirect(url_for('view_employees'))
 
-    departments = [d.dept_name for d in Department.query.order_by(Department.dept_name).all()]
+    departments = department_names()
 
     return render_template('admin/create_employee.html', departments=departments)
 
+# --- Employee Statistics ---
+
+def employee_stats(team_member=None):
+    """Per-member log statistics from one grouping query over the daily rollup.
+
+    Groups by (team_member, function) for the breakdown, total and last log date,
+    joined to the distinct active-day count per member, all in a single round trip.
+    Returns {team_member: stats}, limited to one member if given. Each stats dict has
+    total_logs, active_days, avg_per_day, last_log_date, function_breakdown (highest
+    count first) and top_function. avg_per_day counts only dated logs, since undated
+    ones have no day to be active on.
+    """
+    R = LogDailyRollup
+    filters = [R.log_count > 0]
+    if team_member:
+        filters.append(R.team_member == team_member)
+    per_function = select(
+        R.team_member,
+        R.function,
+        func.sum(R.log_count).label('cnt'),
+        func.sum(case((R.date.isnot(None), R.log_count), else_=0)).label('dated_cnt'),
+        func.max(R.date).label('last_date')
+    ).where(*filters).group_by(R.team_member, R.function).subquery()
+    per_member = select(
+        R.team_member,
+        func.count(func.distinct(R.date)).label('active_days')
+    ).where(*filters).group_by(R.team_member).subquery()
+    rows = db.session.execute(
+        select(per_function, per_member.c.active_days).join(
+            per_member, per_member.c.team_member == per_function.c.team_member
+        ).order_by(per_function.c.team_member, per_function.c.cnt.desc())
+    ).all()
+
+    stats = {}
+    dated_logs = {}
+    for row in rows:
+        member = stats.setdefault(row.team_member, {
+            'total_logs': 0,
+            'active_days': row.active_days,
+            'avg_per_day': 0,
+            'last_log_date': None,
+            'function_breakdown': {},
+            'top_function': row.function,
+        })
+        member['total_logs'] += row.cnt
+        dated_logs[row.team_member] = dated_logs.get(row.team_member, 0) + row.dated_cnt
+        member['function_breakdown'][row.function] = row.cnt
+        if row.last_date and (member['last_log_date'] is None or row.last_date > member['last_log_date']):
+            member['last_log_date'] = row.last_date
+    for name, member in stats.items():
+        if member['active_days']:
+            member['avg_per_day'] = dated_logs[name] / member['active_days']
+    return stats
+
 @app.route('/admin/view_employees')
 @admin_required
 def view_employees():
     users = User.query.order_by(User.username).all()
 
-    # Get the most recent log date for each user in a single query
-    subquery = db.session.query(
-        Log.team_member,
-        func.max(Log.date).label('last_log_date')
-    ).group_by(Log.team_member).subquery()
-
-    last_log_dates = {row.team_member: row.last_log_date for row in db.session.query(subquery).all()}
+    # Get the most recent log date for each user from the shared stats query
+    last_log_dates = {member: stats['last_log_date'] for member, stats in employee_stats().items()}
 
     employees = []
     seven_days_ago = datetime.now().date() - timedelta(days=7)
@@ -1200,11 +2459,93 @@ def reset_employee_password(user_id):
 # ────────────────────────────────────────────────────────────────────────────
 
 
+# --- Production Report Queries ---
+
+def month_date_range(year, month):
+    """Returns (first day of the month, first day of the next month)."""
+    start = date(year, month, 1)
+    end = date(year + 1, 1, 1) if month == 12 else date(year, month + 1, 1)
+    return start, end
+
+def function_date_counts(start, end):
+    """Log counts per (function, date) for start <= date < end.
+
+    Plain range predicates on the date column (rather than EXTRACT(year/month))
+    let the database use the date index and touch only rows in the range.
+    """
+    return db.session.query(
+        LogDailyRollup.function,
+        LogDailyRollup.date,
+        func.sum(LogDailyRollup.log_count)
+    ).filter(
+        LogDailyRollup.date >= start,
+        LogDailyRollup.date < end,
+        LogDailyRollup.function.isnot(None),
+        LogDailyRollup.log_count > 0
+    ).group_by(LogDailyRollup.function, LogDailyRollup.date).all()
+
+# pandas period frequency and column label format per report granularity
+REPORT_GRANULARITIES = {
+    'day': ('D', '%Y-%m-%d'),
+    'week': ('W-SUN', 'Wk of %b %d'),
+    'month': ('M', '%b %Y'),
+}
+
+# Most columns a range report may have per granularity (about 1, 3 and 10 years)
+REPORT_MAX_PERIODS = {'day': 366, 'week': 157, 'month': 120}
+
+def report_period_count(start, end, granularity):
+    """Number of day/week/month columns a report for start..end (inclusive) has."""
+    if granularity == 'day':
+        return (end - start).days + 1
+    if granularity == 'week':
+        return ((end - timedelta(days=end.weekday())) - (start - timedelta(days=start.weekday()))).days // 7 + 1
+    return (end.year - start.year) * 12 + end.month - start.month + 1
+
+def production_pivot(start, end, granularity='day'):
+    """Function x period pivot of log counts for start <= date < end.
+
+    Daily counts come from one range query; bucketing into weeks (Monday-Sunday)
+    or months and the pivot itself are vectorized pandas operations. Returns
+    (periods, rows, column_totals): periods is a list of period start dates, rows
+    has one entry per function with per-period counts and a total.
+    """
+    import pandas as pd
+
+    freq, _ = REPORT_GRANULARITIES[granularity]
+    periods = [p.start_time.date() for p in pd.period_range(start, end - timedelta(days=1), freq=freq)]
+    func_names = report_function_names()
+
+    counts = pd.DataFrame(function_date_counts(start, end), columns=['function', 'date', 'count'])
+    if counts.empty:
+        pivot = pd.DataFrame(0, index=func_names, columns=periods)
+    else:
+        counts['period'] = pd.to_datetime(counts['date']).dt.to_period(freq).dt.start_time.dt.date
+        pivot = counts.pivot_table(
+            index='function', columns='period', values='count', aggfunc='sum', fill_value=0
+        ).reindex(index=func_names, columns=periods, fill_value=0).astype(int)
+
+    totals = pivot.sum(axis=1)
+    rows = [
+        {'function': name, 'periods': dict(zip(periods, (int(v) for v in values))), 'total': int(totals[name])}
+        for name, values in zip(pivot.index, pivot.to_numpy())
+    ]
+    column_totals = {period: int(v) for period, v in pivot.sum(axis=0).items()}
+    return periods, rows, column_totals
+
+def report_function_names():
+    """Sorted names from the Function table plus any function only seen in logs (cached)."""
+    def build():
+        names = {name for name in function_names() if name}
+        names.update(f for (f,) in db.session.query(LogDailyRollup.function).filter(
+            LogDailyRollup.log_count > 0
+        ).distinct() if f)
+        return sorted(names)
+    return cached_dashboard_value('report_function_names', build)
+
 @app.route('/admin/production_report')
 @admin_required
 def production_report():
-    from calendar import monthrange
-
     # --- Date-wise Production Data ---
     today = datetime.utcnow()
     
@@ -1213,10 +2554,10 @@ def production_report():
     default_year = today.year
     default_month = today.month
     try:
-        latest_log = Log.query.order_by(Log.date.desc()).first()
-        if latest_log and latest_log.date:
-            default_year = latest_log.date.year
-            default_month = latest_log.date.month
+        latest_date = db.session.query(func.max(LogDailyRollup.date)).filter(LogDailyRollup.log_count > 0).scalar()
+        if latest_date:
+            default_year = latest_date.year
+            default_month = latest_date.month
     except Exception:
         pass
 
@@ -1235,63 +2576,71 @@ def production_report():
         year = default_year
         month = default_month
 
-    # Get number of days in the selected month
-    num_days = monthrange(year, month)[1]
-    days_in_month = list(range(1, num_days + 1))
-
-    # Get all functions from Function master table
-    functions = Function.query.order_by(Function.name).all()
-    func_names = [f.name for f in functions if f.name]
+    years = list(range(today.year, 2019, -1))
+    months = {i: datetime(2000, i, 1).strftime('%B') for i in range(1, 13)}
+    granularity = request.args.get('granularity', 'day')
+    if granularity not in REPORT_GRANULARITIES:
+        granularity = 'day'
 
-    # Dynamically supplement with any unique functions from logs to ensure no data is missed
+    # Range mode: arbitrary start/end dates (end inclusive) at day/week/month granularity
+    range_start, range_end = None, None
     try:
-        log_func_query = db.session.query(Log.function).distinct().all()
-        log_funcs = [f[0] for f in log_func_query if f[0]]
-        for lf in log_funcs:
-            if lf not in func_names:
-                func_names.append(lf)
-    except Exception:
-        pass
-    func_names = sorted(list(set(func_names)))
+        if request.args.get('start') and request.args.get('end'):
+            range_start = datetime.strptime(request.args['start'], '%Y-%m-%d').date()
+            range_end = datetime.strptime(request.args['end'], '%Y-%m-%d').date()
+            if range_end < range_start:
+                range_start, range_end = range_end, range_start
+    except ValueError:
+        range_start, range_end = None, None
+
+    if range_start and (range_end >= date.max
+                        or report_period_count(range_start, range_end, granularity) > REPORT_MAX_PERIODS[granularity]):
+        flash(f"Date range too long: a {granularity} report covers at most "
+              f"{REPORT_MAX_PERIODS[granularity]} {granularity}s. Choose a shorter range or a coarser granularity.",
+              'warning')
+        range_start, range_end = None, None
+
+    if range_start:
+        periods, production_by_date, column_totals = production_pivot(
+            range_start, range_end + timedelta(days=1), granularity
+        )
+        label_format = REPORT_GRANULARITIES[granularity][1]
+        period_labels = [(p, p.strftime(label_format)) for p in periods]
+        report_title = f"Production by {granularity.capitalize()}: {range_start.strftime('%d %b %Y')} - {range_end.strftime('%d %b %Y')}"
+    else:
+        # Month mode: one column per day of the selected month
+        start, end = month_date_range(year, month)
+        periods, production_by_date, column_totals = production_pivot(start, end, 'day')
+        period_labels = [(p, p.day) for p in periods]
+        report_title = f"Monthly Production by Date: {datetime(year, month, 1).strftime('%B')} {year}"
+
+    today_date = today.date()
+    quarter_start = date(today_date.year, 3 * ((today_date.month - 1) // 3) + 1, 1)
+    quick_ranges = {
+        'Quarter to date': {'start': quarter_start.isoformat(), 'end': today_date.isoformat(), 'granularity': 'week'},
+        'Year to date': {'start': date(today_date.year, 1, 1).isoformat(), 'end': today_date.isoformat(), 'granularity': 'month'},
+    }
 
-    # Query for logs in the selected month (Functions)
-    daily_counts_query = db.session.query(
-        Log.function,
-        extract('day', Log.date).label('day'),
-        func.count(Log.id).label('count')
-    ).filter(
-        extract('year', Log.date) == year,
-        extract('month', Log.date) == month,
-        Log.function.in_(func_names)
-    ).group_by(Log.function, extract('day', Log.date)).all()
-
-    # Process data into a pivot-table like structure
-    data = {f_name: {day: 0 for day in days_in_month} for f_name in func_names}
-    for function_name, day, count in daily_counts_query:
-        if function_name in data and day in data[function_name]:
-            data[function_name][int(day)] = count
-
-    # Prepare final list for template, including totals
-    production_by_date = []
-    for func_name, daily_counts in data.items():
-        production_by_date.append({
-            'function': func_name,
-            'days': daily_counts,
-            'total': sum(daily_counts.values())
-        })
+    return render_template(
+        'admin/production_report.html',
+        production_by_date=production_by_date, period_labels=period_labels, column_totals=column_totals,
+        report_title=report_title, selected_year=year, selected_month=month, years=years, months=months,
+        range_start=range_start, range_end=range_end, granularity=granularity,
+        granularities=list(REPORT_GRANULARITIES), quick_ranges=quick_ranges
+    )
 
-    month_name = datetime(year, month, 1).strftime('%B')
-    years = list(range(today.year, 2019, -1))
-    months = {i: datetime(2000, i, 1).strftime('%B') for i in range(1, 13)}
-    
-    return render_template('admin/production_report.html', production_by_date=production_by_date, days_in_month=days_in_month, month_name=month_name, selected_year=year, selected_month=month, years=years, months=months)
+@app.route('/admin/perf')
+@admin_required
+def perf_report():
+    labels = [f"<{bound}" for bound in PERF_HISTOGRAM_BOUNDS_MS] + [f"\u2265{PERF_HISTOGRAM_BOUNDS_MS[-1]}"]
+    return render_template('admin/perf.html', endpoints=perf_summary(), histogram_labels=labels,
+                           sample_size=PERF_SAMPLE_SIZE, startup_timings=startup_timings)
 
 @app.route('/admin/production_by_department')
 @admin_required
 def production_by_department():
     # Get all departments from the master Department table
-    departments = Department.query.order_by(Department.dept_name).all()
-    existing_dept_names = {d.dept_name for d in departments if d.dept_name}
+    departments = department_names()
 
     # Get total logs per department in a single query
     dept_logs_query = db.session.query(
@@ -1331,8 +2680,7 @@ def production_by_department():
     dept_stats_pre = []
     processed_depts = set()
     
-    for dept in departments:
-        dept_name = dept.dept_name
+    for dept_name in departments:
         dept_stats_pre.append({
             'department': dept_name,
             'total_logs': dept_logs_map.get(dept_name, 0),
@@ -1363,32 +2711,97 @@ def team_member_performance():
     # Get all employee users
     users = User.query.filter(User.role == 'employee').order_by(User.username).all()
     
-    # Get performance stats in one subquery
-    performance_query = db.session.query(
-        Log.team_member,
-        func.count(Log.id).label('total_logs'),
-        func.count(func.distinct(Log.date)).label('active_days'),
-        func.max(Log.date).label('last_log_date')
-    ).group_by(Log.team_member).subquery()
-
-    # Create a dictionary for easy lookup
-    performance_stats = {
-        row.team_member: {
-            'total_logs': row.total_logs,
-            'active_days': row.active_days,
-            'last_log_date': row.last_log_date,
-            'avg_per_day': (row.total_logs / row.active_days) if row.active_days > 0 else 0
-        }
-        for row in db.session.query(performance_query).all()
-    }
+    # Get performance stats for every member in one query
+    performance_stats = employee_stats()
 
     performance_data = []
     for user in users:
-        stats = performance_stats.get(user.username, {'total_logs': 0, 'avg_per_day': 0, 'last_log_date': None})
-        performance_data.append({'username': user.username, 'department': user.department, **stats})
+        stats = performance_stats.get(user.username, {'total_logs': 0, 'active_days': 0, 'last_log_date': None})
+        performance_data.append({
+            'username': user.username,
+            'department': user.department,
+            'total_logs': stats['total_logs'],
+            'active_days': stats['active_days'],
+            # This page has always averaged all logs, undated ones included, over the
+            # dated active days, so it keeps that rather than the stats engine's
+            # dated-only avg_per_day
+            'avg_per_day': stats['total_logs'] / stats['active_days'] if stats['active_days'] else 0,
+            'last_log_date': stats['last_log_date'],
+        })
 
     return render_template('admin/team_member_performance.html', performance_data=performance_data)
 
+TRACKER_PAGE_SIZE = 100
+
+def encode_cursor_values(log_date, log_id):
+    """Encodes a (date, id) sort key as a URL-safe cursor string."""
+    return f"{log_date.isoformat() if log_date else 'null'}_{log_id}"
+
+def encode_log_cursor(log):
+    """Encodes a log's (date, id) sort key as a URL-safe cursor string."""
+    return encode_cursor_values(log.date, log.id)
+
+def decode_log_cursor(value):
+    """Parses a cursor from encode_log_cursor into (date or None, id); None if invalid."""
+    try:
+        date_part, id_part = value.split('_')
+        log_date = None if date_part == 'null' else datetime.strptime(date_part, '%Y-%m-%d').date()
+        return log_date, int(id_part)
+    except (AttributeError, ValueError):
+        return None
+
+def _first_rows(queries, count):
+    """Runs the queries in turn, each limited to the rows still missing, until count rows are found."""
+    rows = []
+    for query in queries:
+        rows += query.limit(count - len(rows)).all()
+        if len(rows) >= count:
+            break
+    return rows
+
+def fetch_tracker_page(filters, after=None, before=None, limit=TRACKER_PAGE_SIZE):
+    """Keyset page of logs ordered by (date DESC NULLS LAST, id DESC).
+
+    `after` walks to older rows and `before` to newer rows, both given as decoded
+    cursors. Each page seeks on the (date, id) composite index instead of counting
+    and skipping with OFFSET, so deep pages cost the same as the first one. Dated
+    and undated rows are read by separate queries, because an OR of the two
+    predicates cannot seek the index; undated rows are only read once the dated
+    ones run out. Returns (logs, has_newer, has_older).
+    """
+    query = Log.query.filter(*filters)
+    dated = query.filter(Log.date.isnot(None))
+    undated = query.filter(Log.date.is_(None))
+    if before is not None:
+        log_date, log_id = before
+        newer_dated = dated.order_by(Log.date.asc(), Log.id.asc())
+        if log_date is None:
+            queries = [undated.filter(Log.id > log_id).order_by(Log.id.asc()), newer_dated]
+        else:
+            queries = [newer_dated.filter(tuple_(Log.date, Log.id) > tuple_(log_date, log_id))]
+        logs = _first_rows(queries, limit + 1)
+        return logs[:limit][::-1], len(logs) > limit, True
+
+    older_dated = dated.order_by(Log.date.desc().nulls_last(), Log.id.desc())
+    older_undated = undated.order_by(Log.id.desc())
+    if after is None:
+        queries = [older_dated, older_undated]
+    else:
+        log_date, log_id = after
+        if log_date is None:
+            queries = [older_undated.filter(Log.id < log_id)]
+        else:
+            queries = [older_dated.filter(tuple_(Log.date, Log.id) < tuple_(log_date, log_id)), older_undated]
+    logs = _first_rows(queries, limit + 1)
+    return logs[:limit], after is not None, len(logs) > limit
+
+def tracker_link_cursor(log, fallback):
+    """Cursor for a tracker page link: the edge row's sort key, or the request's own
+    cursor values when the page came back empty."""
+    if log is not None:
+        return encode_log_cursor(log)
+    return encode_cursor_values(*fallback) if fallback else None
+
 @app.route('/admin/tracker')
 @admin_required
 def track_employee():
@@ -1396,17 +2809,40 @@ def track_employee():
     employees = [user.username for user in users]
 
     selected_employee = request.args.get('employee')
-    page = request.args.get('page', 1, type=int)
-    
-    query = Log.query
-    if selected_employee:
-        query = query.filter_by(team_member=selected_employee)
-        
-    # Add pagination to the query
-    pagination = query.order_by(Log.date.desc(), Log.id.desc()).paginate(page=page, per_page=100, error_out=False)
-    logs_to_display = pagination.items
+    page = max(request.args.get('page', 1, type=int), 1)
+
+    # Filters for the log page and its row count
+    log_filters = [Log.team_member == selected_employee] if selected_employee else []
+    rollup_filters = [LogDailyRollup.team_member == selected_employee] if selected_employee else []
+
+    after = decode_log_cursor(request.args.get('after'))
+    before = decode_log_cursor(request.args.get('before'))
+    if (request.args.get('after') and after is None) or (request.args.get('before') and before is None):
+        flash('That page link is no longer valid, showing the newest logs instead.', 'warning')
+        page = 1
+    logs_to_display, has_prev, has_next = fetch_tracker_page(log_filters, after=after, before=before)
+    # The cursor is a sort key, not a row lookup, so it still works after its row is
+    # deleted. A page can only come back empty when every row past the cursor is gone;
+    # the links then seek from the cursor values so the user keeps their place.
+    if not logs_to_display and (after or before):
+        flash('The logs on this page have been removed since it was opened.', 'warning')
+
+    # Total row count comes from the daily rollup and is cached until the next log write
+    total_logs = cached_dashboard_value(
+        ('tracker_total', selected_employee),
+        lambda: int(db.session.query(func.sum(LogDailyRollup.log_count)).filter(*rollup_filters).scalar() or 0)
+    )
+    pagination = {
+        'page': page,
+        'pages': max((total_logs + TRACKER_PAGE_SIZE - 1) // TRACKER_PAGE_SIZE, 1),
+        'total': total_logs,
+        'has_prev': has_prev,
+        'has_next': has_next,
+        'prev_cursor': tracker_link_cursor(logs_to_display[0] if logs_to_display else None, after) if has_prev else None,
+        'next_cursor': tracker_link_cursor(logs_to_display[-1] if logs_to_display else None, before) if has_next else None,
+    }
 
-    # Calculate Statistics if an employee is selected, using SQL aggregations
+    # Calculate Statistics if an employee is selected, using the shared stats query
     stats = {
         'avg_per_day': 0,
         'top_function': 'N/A',
@@ -1414,138 +2850,258 @@ def track_employee():
     }
 
     if selected_employee:
-        # 1. Function Breakdown and Top Function (SQL)
-        function_breakdown_query = db.session.query(
-            Log.function, 
-            func.count(Log.id)
-        ).filter(
-            Log.team_member == selected_employee
-        ).group_by(
-            Log.function
-        ).order_by(
-            func.count(Log.id).desc()
-        ).all()
-
-        if function_breakdown_query:
-            stats['function_breakdown'] = dict(function_breakdown_query)
-            stats['top_function'] = function_breakdown_query[0][0]
-
-        # 2. Average files per day (SQL)
-        daily_counts_subquery = db.session.query(
-            func.count(Log.id).label('daily_count')
-        ).filter(Log.team_member == selected_employee).group_by(Log.date).subquery()
-
-        avg_per_day_query = db.session.query(func.avg(daily_counts_subquery.c.daily_count)).scalar()
-        
-        if avg_per_day_query is not None:
-            stats['avg_per_day'] = round(float(avg_per_day_query), 2)
+        member_stats = employee_stats(selected_employee).get(selected_employee)
+        if member_stats:
+            stats['function_breakdown'] = member_stats['function_breakdown']
+            stats['top_function'] = member_stats['top_function']
+            stats['avg_per_day'] = round(member_stats['avg_per_day'], 2)
 
     return render_template('admin/track_employee.html', employees=employees, logs=logs_to_display, selected_employee=selected_employee, stats=stats, pagination=pagination)
 
+# Detailed Logs columns for the tracker export: (header, Log column)
+TRACKER_EXPORT_COLUMNS = [
+    ("Date", Log.date),
+    ("Function", Log.function),
+    ("File Number", Log.file_number),
+    ("Status", Log.status),
+    ("Department", Log.department),
+    ("Comments", Log.comments),
+    ("Count", Log.count),
+    ("Bucket", Log.bucket),
+    ("Production Task", Log.production_task),
+    ("Month", Log.month),
+]
+
+def iter_tracker_export_rows(employee, batch_size=1000):
+    """Yields an employee's logs as tuples, fetching batch_size rows at a time."""
+    query = db.session.query(*[column for _, column in TRACKER_EXPORT_COLUMNS]).filter(
+        Log.team_member == employee
+    ).order_by(Log.date.asc(), Log.id.asc()).execution_options(yield_per=batch_size)
+    for row in query:
+        yield tuple(row)
+
+def iter_file_chunks(fileobj, chunk_size=64 * 1024):
+    """Streams an open file in chunks and closes it afterwards."""
+    try:
+        while True:
+            data = fileobj.read(chunk_size)
+            if not data:
+                break
+            yield data
+    finally:
+        fileobj.close()
+
+def _write_only_sheet(workbook, title, headers, rows):
+    """Appends a bold header row and the given rows to a new write-only worksheet."""
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import Font
+
+    ws = workbook.create_sheet(title)
+    header_cells = []
+    for header in headers:
+        cell = WriteOnlyCell(ws, value=header)
+        cell.font = Font(bold=True)
+        header_cells.append(cell)
+    ws.append(header_cells)
+    for row in rows:
+        ws.append(row)
+
 @app.route('/admin/tracker/export')
 @admin_required
 def export_tracker_data():
     selected_employee = request.args.get('employee')
+    export_format = request.args.get('format', 'xlsx')
     if not selected_employee:
         flash('Please select an employee to export data.', 'warning')
         return redirect(url_for('track_employee'))
 
-    # Fetch logs for the selected employee, ordered by date
-    logs = Log.query.filter_by(team_member=selected_employee).order_by(Log.date.asc()).all()
-
-    if not logs:
+    if db.session.query(Log.id).filter(Log.team_member == selected_employee).first() is None:
         flash(f'No logs found for {selected_employee} to export.', 'info')
         return redirect(url_for('track_employee', employee=selected_employee))
 
-    # Create a pandas DataFrame from the log data
-    df = pd.DataFrame(
-        [
-            {
-                "Date": log.date,
-                "Function": log.function,
-                "File Number": log.file_number,
-                "Status": log.status,
-                "Department": log.department,
-                "Comments": log.comments,
-                "Count": log.count,
-                "Bucket": log.bucket,
-                "Production Task": log.production_task,
-                "Month": log.month,
-            }
-            for log in logs
-        ]
-    )
-
-    # --- Create Excel Data in Memory ---
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='openpyxl') as writer:
-        # Sheet 1: Detailed Logs
-        df.to_excel(writer, sheet_name='Detailed Logs', index=False)
-
-        # Sheet 2: Date-wise file count (Daily Summary)
-        if 'Date' in df.columns:
-            df_date_summary = df.groupby('Date').size().reset_index(name='Files Count')
-            df_date_summary.to_excel(writer, sheet_name='Daily Summary', index=False)
-
-        # Sheet 3: Function distribution
-        if 'Function' in df.columns:
-            df_func_dist = df['Function'].value_counts().reset_index()
-            df_func_dist.columns = ['Function', 'Count']
-            df_func_dist.to_excel(writer, sheet_name='Function Distribution', index=False)
+    headers = [header for header, _ in TRACKER_EXPORT_COLUMNS]
+    base_filename = f"{selected_employee}_Tracker_Report_{datetime.now().strftime('%Y-%m-%d')}"
+
+    if export_format == 'csv':
+        # Detailed Logs only, encoded and sent batch by batch as rows are fetched
+        def generate_csv():
+            buffer = io.StringIO()
+            writer = csv.writer(buffer)
+            writer.writerow(headers)
+            for i, row in enumerate(iter_tracker_export_rows(selected_employee), start=1):
+                writer.writerow(row)
+                if i % 1000 == 0:
+                    yield buffer.getvalue()
+                    buffer.seek(0)
+                    buffer.truncate(0)
+            yield buffer.getvalue()
+
+        return Response(
+            stream_with_context(generate_csv()),
+            mimetype="text/csv",
+            headers={"Content-Disposition": f"attachment;filename={base_filename}.csv"}
+        )
 
-    output.seek(0)
+    # Summary sheets are aggregated in SQL from the daily rollup
+    daily_summary = db.session.query(
+        LogDailyRollup.date, func.sum(LogDailyRollup.log_count)
+    ).filter(
+        LogDailyRollup.team_member == selected_employee, LogDailyRollup.date.isnot(None), LogDailyRollup.log_count > 0
+    ).group_by(LogDailyRollup.date).order_by(LogDailyRollup.date).all()
 
-    # --- Serve the file for download ---
-    filename = f"{selected_employee}_Tracker_Report_{datetime.now().strftime('%Y-%m-%d')}.xlsx"
+    function_distribution = db.session.query(
+        LogDailyRollup.function, func.sum(LogDailyRollup.log_count)
+    ).filter(
+        LogDailyRollup.team_member == selected_employee, LogDailyRollup.function.isnot(None), LogDailyRollup.log_count > 0
+    ).group_by(LogDailyRollup.function).order_by(func.sum(LogDailyRollup.log_count).desc()).all()
+
+    # --- Write-only workbook: rows are flushed to disk as they are appended ---
+    from openpyxl import Workbook
+    with EXPORT_DURATION.labels('tracker_xlsx').time():
+        workbook = Workbook(write_only=True)
+        _write_only_sheet(workbook, 'Detailed Logs', headers, iter_tracker_export_rows(selected_employee))
+        _write_only_sheet(workbook, 'Daily Summary', ['Date', 'Files Count'], (tuple(r) for r in daily_summary))
+        _write_only_sheet(workbook, 'Function Distribution', ['Function', 'Count'], (tuple(r) for r in function_distribution))
+
+        output = tempfile.TemporaryFile()
+        workbook.save(output)
+        output.seek(0)
+
+    # --- Stream the file for download ---
     return Response(
-        output,
+        iter_file_chunks(output),
         mimetype="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment;filename={filename}"}
+        headers={"Content-Disposition": f"attachment;filename={base_filename}.xlsx"}
     )
 
 @app.route('/logo.png')
 def serve_logo():
     return send_from_directory(os.path.join(BASE_DIR, 'templates'), 'logo.png')
 
+@app.route('/metrics')
+def metrics():
+    """Prometheus text exposition of the metrics of all worker processes.
+
+    When METRICS_TOKEN is set, scrapers must send it as a bearer token. In production
+    the endpoint is disabled unless a token is configured.
+    """
+    if METRICS_TOKEN:
+        if not secrets.compare_digest(request.headers.get('Authorization', ''), f"Bearer {METRICS_TOKEN}"):
+            return Response('Unauthorized', status=401, headers={'WWW-Authenticate': 'Bearer'})
+    elif os.environ.get('FLASK_ENV') == 'production':
+        return Response('Not Found', status=404)
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
 @app.route('/favicon.ico')
 def favicon():
     # Handle browser request for favicon to prevent 404 error
     return '', 204
 
+def chart_data_version():
+    """(version, cursor) for the chart data. cursor is the latest rollup change number
+    (a primary-key lookup, so checking costs the same at any history size); version
+    also covers the cached function list."""
+    cursor = shared_cache_version(ROLLUP_CHANGE_COUNTER) or 0
+    fingerprint = f"{cursor}|{chr(31).join(function_names())}"
+    return hashlib.sha1(fingerprint.encode()).hexdigest(), cursor
+
+def parse_date_param(name):
+    """Returns the YYYY-MM-DD query parameter as a date, or None if missing/invalid."""
+    try:
+        return datetime.strptime(request.args[name], '%Y-%m-%d').date()
+    except (KeyError, ValueError):
+        return None
+
+def parse_cursor_param(name):
+    """Returns a chart data cursor query parameter (a rollup change number), or None if missing/invalid."""
+    try:
+        return max(int(request.args[name]), 0)
+    except (KeyError, ValueError):
+        return None
+
 @app.route('/chart-data')
 @admin_required
 def chart_data():
+    """Per-date function counts. Optional start/end (YYYY-MM-DD, inclusive) limit the
+    dates returned. Every response carries its write cursor in X-Chart-Data-Cursor;
+    passing it back as since returns only the dates whose counts changed after it,
+    whatever their log date (backdated entries and past-month imports included), so
+    a dashboard that already holds history only fetches what changed. The cursor is
+    read before the data, so a write that lands in between is returned again next
+    time rather than missed. Responses carry an ETag; conditional requests
+    (If-None-Match) get a 304 when no log has been written since. There is no
+    Last-Modified: second-resolution dates cannot tell apart writes made within the
+    same second.
+
+    format=columnar returns {"dates", "functions", "counts"} where counts[i][j] is the
+    count for functions[i] on dates[j], gzip-compressed when the client accepts it.
+    The default is the original list of per-date dicts.
+    """
+    import pandas as pd
+
     try:
-        # Query logs and aggregate by date and function
-        logs_by_date_func = db.session.query(
-            Log.date,
-            Log.function,
-            func.count(Log.id)
-        ).group_by(Log.date, Log.function).all()
-
-        all_functions = [f.name for f in Function.query.order_by(Function.name).all()]
-        columns = all_functions + ["Total Hours"] # Total Hours seems unused, keeping for compatibility
-
-        # Aggregate data by Date
-        aggregated_data = {}
-        for log_date, function, count in logs_by_date_func:
-            if not log_date:
-                continue
-            
-            date_str = log_date.strftime('%Y-%m-%d')
-                
-            if date_str not in aggregated_data:
-                # Initialize row with 0s
-                row = {col: 0 for col in columns}
-                row['Date'] = date_str
-                aggregated_data[date_str] = row
-            
-            # Increment count if the function matches a column
-            if function in aggregated_data[date_str]:
-                aggregated_data[date_str][function] += count
-
-        # Convert dict to list
-        return jsonify(list(aggregated_data.values()))
+        start, end, since = parse_date_param('start'), parse_date_param('end'), parse_cursor_param('since')
+        columnar = request.args.get('format') == 'columnar'
+        compress = columnar and 'gzip' in request.accept_encodings
+        version, cursor = chart_data_version()
+        etag = hashlib.sha1(f"{version}|{start}|{end}|{since}|{columnar}|{compress}".encode()).hexdigest()
+
+        if request.if_none_match.contains(etag):
+            response = Response(status=304)
+        else:
+            filters = [LogDailyRollup.date.isnot(None)]
+            if start:
+                filters.append(LogDailyRollup.date >= start)
+            if end:
+                filters.append(LogDailyRollup.date <= end)
+            if since is not None:
+                # Whole dates, so a client can replace each returned date; rows that
+                # dropped to zero are kept by the rollup and report their date here
+                changed_dates = select(LogDailyRollup.date).where(LogDailyRollup.change_seq > since).distinct()
+                filters.append(LogDailyRollup.date.in_(changed_dates))
+            else:
+                filters.append(LogDailyRollup.log_count > 0)
+            # Query logs and aggregate by date and function
+            logs_by_date_func = db.session.query(
+                LogDailyRollup.date,
+                LogDailyRollup.function,
+                func.sum(LogDailyRollup.log_count)
+            ).filter(*filters).group_by(LogDailyRollup.date, LogDailyRollup.function).all()
+
+            all_functions = function_names()
+            columns = all_functions if columnar else all_functions + ["Total Hours"] # Total Hours seems unused, keeping for compatibility
+
+            # Pivot to one row per date in a single pandas pass
+            counts = pd.DataFrame(logs_by_date_func, columns=['Date', 'function', 'count'])
+            counts = counts[counts['function'].isin(all_functions)]
+            dates = sorted({log_date for log_date, _, _ in logs_by_date_func})
+            pivot = counts.pivot_table(
+                index='Date', columns='function', values='count', aggfunc='sum', fill_value=0
+            ).reindex(index=dates, columns=columns, fill_value=0).astype(int)
+            date_strings = [d.strftime('%Y-%m-%d') for d in pivot.index]
+
+            if columnar:
+                payload = json.dumps({
+                    'dates': date_strings,
+                    'functions': columns,
+                    'counts': pivot.T.to_numpy().tolist(),
+                }, separators=(',', ':')).encode()
+                response = Response(gzip.compress(payload, compresslevel=6) if compress else payload,
+                                    mimetype='application/json')
+                if compress:
+                    response.headers['Content-Encoding'] = 'gzip'
+            else:
+                pivot['Date'] = date_strings
+                response = jsonify(pivot.to_dict('records'))
+
+        response.set_etag(etag)
+        response.headers['X-Chart-Data-Cursor'] = str(cursor)
+        response.cache_control.private = True
+        response.cache_control.no_cache = True
+        response.vary.add('Accept-Encoding')
+        return response
     except Exception as e:
         print(f"Error generating chart data: {e}")
         return jsonify({'error': str(e)})
@@ -1553,7 +3109,7 @@ def chart_data():
 @app.cli.command("init-db")
 def init_db_command():
     """Creates the database tables and a default admin user."""
-    db.create_all()
+    apply_migrations()
     if not User.query.filter_by(username='admin').first():
         hashed_password = generate_password_hash('admin')
         admin_user = User(username='admin', password=hashed_password, role='admin', department='System')
@@ -1575,6 +3131,7 @@ def init_db_command():
         for func_name in default_functions:
             db.session.add(Function(name=func_name))
         db.session.commit()
+        invalidate_catalogue()
         print("Functions table populated.")
 
     if not Department.query.first():
@@ -1594,21 +3151,334 @@ def init_db_command():
         for dept_name in default_departments:
             db.session.add(Department(dept_name=dept_name))
         db.session.commit()
+        invalidate_catalogue()
         print("Department table populated.")
 
+# --- Bulk Log Import Helpers ---
+
+# Rows per chunk for the Raw Data loader. Each chunk is converted in one vectorized
+# pass and written with a single executemany/COPY, so memory used by the insert
+# stage stays bounded regardless of how many rows the workbook has.
+LOG_IMPORT_CHUNK_SIZE = 5000
+
+# Raw Data sheet column -> Log column for plain text fields
+RAW_LOG_TEXT_COLUMNS = {
+    'Team Member (First Last)': 'team_member',
+    'Function': 'function',
+    'File  Number': 'file_number',
+    'Status': 'status',
+    'Escalation Reason': 'tier1_escalation_reason',
+    'Department': 'department',
+    'Bucket': 'bucket',
+    'Time': 'time',
+    'Production Task': 'production_task',
+    'Month': 'month',
+}
+
+# Log fields filled from a Raw Data row; these also make up the row fingerprint
+LOG_FIELD_COLUMNS = [
+    'team_member', 'function', 'date', 'file_number', 'status', 'tier1_escalation_reason',
+    'im_escalation_reason', 'department', 'comments', 'count', 'bucket', 'time',
+    'production_task', 'month',
+]
+LOG_INSERT_COLUMNS = LOG_FIELD_COLUMNS + ['row_hash']
+
+
+def iter_sheet_chunks(path, sheet_name, chunk_size):
+    """Streams a worksheet as DataFrames of at most chunk_size rows.
+
+    Uses openpyxl's read-only mode, which parses the sheet XML row by row instead of
+    building the full cell object model, so memory stays flat as workbooks grow.
+    Header names are stripped and repeated ones renamed to X.1, X.2, ... as
+    pd.read_excel did; fully blank rows are skipped.
+    """
+    import pandas as pd
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook[sheet_name].iter_rows(values_only=True)
+        header = next(rows, None)
+        if header is None:
+            return
+        columns = []
+        for i, h in enumerate(header):
+            name = base = str(h).strip() if h is not None else f"Unnamed: {i}"
+            suffix = 0
+            while name in columns:
+                suffix += 1
+                name = f"{base}.{suffix}"
+            columns.append(name)
+        buffer = []
+        for row in rows:
+            if all(v is None for v in row):
+                continue
+            buffer.append(row[:len(columns)])
+            if len(buffer) >= chunk_size:
+                yield pd.DataFrame(buffer, columns=columns)
+                buffer = []
+        if buffer:
+            yield pd.DataFrame(buffer, columns=columns)
+    finally:
+        workbook.close()
+
+
+def read_sheet_frame(path, sheet_name, chunk_size=LOG_IMPORT_CHUNK_SIZE):
+    """Reads a small worksheet (e.g. Team Member Performance) into a single DataFrame."""
+    import pandas as pd
+
+    chunks = list(iter_sheet_chunks(path, sheet_name, chunk_size))
+    return pd.concat(chunks, ignore_index=True) if chunks else pd.DataFrame()
+
+
+def scan_raw_data_sheet(path, chunk_size):
+    """Collects the small per-file facts the importer needs before inserting logs.
+
+    Makes one streaming pass over Raw Data and returns its columns, row count,
+    departments, team member -> department map and months, without holding the
+    sheet in memory. Months are normalized the way log rows store them, so they can
+    be compared with Log.month.
+    """
+    summary = {'columns': [], 'rows': 0, 'departments': set(), 'department_map': {}, 'months': set()}
+    for chunk in iter_sheet_chunks(path, 'Raw Data', chunk_size):
+        summary['columns'] = list(chunk.columns)
+        summary['rows'] += len(chunk)
+        if 'Department' in chunk.columns:
+            summary['departments'].update(chunk['Department'].dropna().unique())
+            if 'Team Member (First Last)' in chunk.columns:
+                df_dept = chunk[['Team Member (First Last)', 'Department']].dropna()
+                members = df_dept['Team Member (First Last)'].astype(str).str.strip()
+                for member, dept in zip(members, df_dept['Department']):
+                    summary['department_map'].setdefault(member, dept)
+        if 'Month' in chunk.columns:
+            summary['months'].update(_raw_text_column(chunk, 'Month').dropna().unique())
+    return summary
+
+
+def _raw_text_column(df, column):
+    """Returns a column as strings, with NaN and empty cells mapped to None.
+
+    A blank cell turns a numeric column into float64 for that chunk only, so
+    whole-number floats are written as ints ('1003', not '1003.0') to keep the text,
+    and the row fingerprint, independent of which chunk a row lands in. For the same
+    reason datetimes (e.g. date-typed Month cells) are always written as
+    'YYYY-MM-DD HH:MM:SS', whether the chunk holds them as datetime64 or as objects.
+    """
+    import pandas as pd
+
+    if column not in df.columns:
+        return pd.Series(None, index=df.index, dtype=object)
+    values = df[column]
+    as_text = values.astype(str)
+    if pd.api.types.is_datetime64_any_dtype(values):
+        as_text = values.dt.strftime('%Y-%m-%d %H:%M:%S')
+    if pd.api.types.is_float_dtype(values):
+        whole = values.notna() & (values % 1 == 0)
+        as_text = as_text.mask(whole, values[whole].astype('int64').astype(str))
+    return as_text.where(values.notna() & (as_text.str.strip() != ''), None).astype(object)
+
+
+def _raw_date_column(values):
+    """Parses the Raw Data date column in one pass.
+
+    Excel date cells already arrive as datetime64; text cells in mixed formats are
+    parsed per element, and anything unparseable becomes NaT.
+    """
+    import pandas as pd
+
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    return pd.to_datetime(values, errors='coerce', format='mixed')
+
+
+def normalize_raw_log_chunk(df):
+    """Converts a slice of the Raw Data sheet into Log insert records.
+
+    Dates, counts and text columns are converted with vectorized pandas operations.
+    Rows without a team member or a parseable date are dropped, matching the
+    row-by-row rules the importer used before.
+    """
+    import pandas as pd
+
+    frame = pd.DataFrame(index=df.index)
+    for source, target in RAW_LOG_TEXT_COLUMNS.items():
+        frame[target] = _raw_text_column(df, source)
+
+    dates = _raw_date_column(df['Date (mm/dd/yy)'])
+    keep = frame['team_member'].notna() & dates.notna()
+    frame = frame[keep]
+
+    frame['date'] = dates[keep].dt.date
+    frame['im_escalation_reason'] = None
+    frame['comments'] = None
+    if 'Count' in df.columns:
+        counts = pd.to_numeric(df.loc[keep, 'Count'], errors='coerce')
+        valid = counts.notna() & (counts > 0) & (counts % 1 == 0)
+        frame['count'] = counts.where(valid, 1).astype(int)
+    else:
+        frame['count'] = 1
+
+    frame = frame[LOG_FIELD_COLUMNS].astype(object)
+    return frame.where(frame.notna(), None)
+
+
+class RowOccurrences:
+    """How many times each row digest has been seen so far in one file.
+
+    Every distinct row costs one 8-byte key (the first 8 bytes of its SHA-1) in a
+    sorted numpy array, about 8 MB per million rows. Only rows that actually repeat
+    also get a dict entry holding their count.
+    """
+
+    def __init__(self):
+        import numpy as np
+
+        self.keys = np.empty(0, dtype=np.uint64)
+        self.repeats = {}
+
+    def number(self, digests):
+        """Returns the occurrence number (0 for the first) of each digest, in order."""
+        import numpy as np
+
+        keys = np.array([int.from_bytes(d[:8], 'big') for d in digests], dtype=np.uint64)
+        positions = np.minimum(np.searchsorted(self.keys, keys), max(len(self.keys) - 1, 0))
+        known = self.keys[positions] == keys if len(self.keys) else np.zeros(len(keys), dtype=bool)
+        new_keys = set()
+        occurrences = []
+        for key, was_known in zip(keys.tolist(), known.tolist()):
+            if was_known or key in new_keys:
+                occurrence = self.repeats.get(key, 1)
+                self.repeats[key] = occurrence + 1
+            else:
+                new_keys.add(key)
+                occurrence = 0
+            occurrences.append(occurrence)
+        if new_keys:
+            self.keys = np.union1d(self.keys, np.fromiter(new_keys, dtype=np.uint64, count=len(new_keys)))
+        return occurrences
+
+
+def fingerprint_log_rows(frame, occurrences):
+    """Computes a stable fingerprint for each normalized Raw Data row.
+
+    The fingerprint is a SHA-1 of the row's field values. Identical rows within one
+    file are told apart by their occurrence number, so a cumulative file re-imported
+    later produces the same fingerprints for the rows it already contained.
+    `occurrences` (a RowOccurrences) carries the counts across chunks of the same file.
+    """
+    import pandas as pd
+
+    content = frame[LOG_FIELD_COLUMNS[0]].map(lambda v: '' if v is None else str(v))
+    for column in LOG_FIELD_COLUMNS[1:]:
+        content = content + '\x1f' + frame[column].map(lambda v: '' if v is None else str(v))
+
+    digests = [hashlib.sha1(row.encode('utf-8')).digest() for row in content]
+    hashes = []
+    for digest, occurrence in zip(digests, occurrences.number(digests)):
+        digest = digest.hex()
+        if occurrence:
+            digest = hashlib.sha1(f"{digest}:{occurrence}".encode('ascii')).hexdigest()
+        hashes.append(digest)
+    return pd.Series(hashes, index=frame.index, dtype=object)
+
+
+def existing_row_hashes(hashes, batch_size=1000):
+    """Returns the subset of the given fingerprints that are already stored in the log table."""
+    hashes = list(hashes)
+    found = set()
+    for i in range(0, len(hashes), batch_size):
+        batch = hashes[i:i + batch_size]
+        found.update(h for (h,) in db.session.query(Log.row_hash).filter(Log.row_hash.in_(batch)))
+    return found
+
+
+def _copy_log_records(frame):
+    """Streams a normalized chunk into the log table using PostgreSQL COPY."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(frame.itertuples(index=False, name=None))
+    buffer.seek(0)
+    cursor = db.session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY log ({', '.join(LOG_INSERT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer
+        )
+    finally:
+        cursor.close()
+
+
+def insert_log_records(frame):
+    """Writes a normalized chunk with COPY on PostgreSQL, or a Core executemany insert elsewhere."""
+    if frame.empty:
+        return 0
+    if db.engine.dialect.name == 'postgresql':
+        _copy_log_records(frame)
+    else:
+        db.session.execute(insert(Log.__table__), frame.to_dict('records'))
+    add_log_rollup_counts(frame)
+    db.session.commit()
+    return len(frame)
+
+
+def load_raw_log_chunks(chunks, skip_existing=False, total_rows=None):
+    """Normalizes and inserts Raw Data chunks one at a time, reporting throughput.
+
+    With skip_existing, rows whose fingerprint is already in the log table are
+    left out, so re-importing a cumulative file only inserts the new rows.
+    total_rows (the sheet's row count) drives the import progress gauge.
+    Returns the number of log rows inserted.
+    """
+    started = time.perf_counter()
+    total_read = 0
+    total_imported = 0
+    total_skipped = 0
+    # Occurrence counts for the whole file (8 bytes per distinct row, see RowOccurrences)
+    occurrences = RowOccurrences()
+    for batch_num, chunk in enumerate(chunks, start=1):
+        total_read += len(chunk)
+        frame = normalize_raw_log_chunk(chunk)
+        frame['row_hash'] = fingerprint_log_rows(frame, occurrences)
+        if skip_existing and not frame.empty:
+            already_present = frame['row_hash'].isin(existing_row_hashes(frame['row_hash']))
+            total_skipped += int(already_present.sum())
+            IMPORT_ROWS.labels('skipped').inc(int(already_present.sum()))
+            frame = frame[~already_present]
+        inserted = insert_log_records(frame)
+        total_imported += inserted
+        IMPORT_ROWS.labels('read').inc(len(chunk))
+        IMPORT_ROWS.labels('imported').inc(inserted)
+        LOG_WRITES.labels('import').inc(inserted)
+        if total_rows:
+            IMPORT_PROGRESS.set(min(total_read / total_rows, 1.0))
+        elapsed = time.perf_counter() - started
+        rate = total_read / elapsed if elapsed > 0 else 0
+        print(f"  Chunk {batch_num}: {total_imported} rows committed, {total_skipped} already present "
+              f"({total_read} read, {rate:,.0f} rows/s)...")
+
+    elapsed = time.perf_counter() - started
+    if total_read:
+        print(f"Log insert stage: {total_imported}/{total_read} rows in {elapsed:.2f}s "
+              f"({total_read / elapsed if elapsed > 0 else 0:,.0f} rows/s).")
+    return total_imported
+
+
 @app.cli.command("import-data")
 @click.option('--yes', is_flag=True, default=False, help='Confirm DROP of all log data and re-import. Required in full-replace mode.')
 @click.option('--file', default=None, help='Name of the Excel file in the project folder to import (e.g. "Production & Performance Report till Aug 5th.xlsx").')
-@click.option('--append', is_flag=True, default=False, help='Append new data without dropping existing logs. Safe for adding a new month on top of existing data.')
-def import_data_command(yes, file, append):
+@click.option('--append', is_flag=True, default=False, help='Append new data without dropping existing logs. Rows already imported (matched by row fingerprint) are skipped, so cumulative files can be re-imported.')
+@click.option('--chunk-size', default=LOG_IMPORT_CHUNK_SIZE, show_default=True, type=click.IntRange(min=1), help='Number of Raw Data rows converted and inserted per chunk. Bounds memory used by the log insert stage.')
+def import_data_command(yes, file, append, chunk_size):
     """Imports users and log data from a production report Excel file.
 
     Full-replace mode (drops existing logs):
       flask import-data --file "MyFile.xlsx" --yes
 
-    Append mode (keeps existing logs, adds new rows):
+    Append mode (keeps existing logs, adds only rows not imported before):
       flask import-data --file "MyFile.xlsx" --append
     """
+    import pandas as pd
+    from openpyxl import load_workbook
+
     if not append and not yes:
         print("\n[WARNING] This command will DROP the entire Log table and re-import all data.")
         print("   All existing log rows will be PERMANENTLY DELETED.")
@@ -1629,20 +3499,20 @@ def import_data_command(yes, file, append):
     print(f"\n--- {mode_label} Starting import from: {os.path.basename(new_report_file)} ---")
 
     try:
-        xls = pd.ExcelFile(new_report_file)
-        if 'Team Member Performance' not in xls.sheet_names or 'Raw Data' not in xls.sheet_names:
-            print(f"Error: Required sheets not found. Available: {xls.sheet_names}")
+        workbook = load_workbook(new_report_file, read_only=True)
+        sheet_names = workbook.sheetnames
+        workbook.close()
+        if 'Team Member Performance' not in sheet_names or 'Raw Data' not in sheet_names:
+            print(f"Error: Required sheets not found. Available: {sheet_names}")
             return
 
-        print("Reading Excel sheets (this may take a moment for large files)...")
-        df_performance = pd.read_excel(xls, sheet_name='Team Member Performance')
-        df_raw = pd.read_excel(xls, sheet_name='Raw Data')
-        df_performance.columns = df_performance.columns.str.strip()
-        df_raw.columns = df_raw.columns.str.strip()
-        print(f"Read {len(df_raw)} rows from Raw Data sheet.")
+        print("Scanning Excel sheets (streaming, read-only)...")
+        df_performance = read_sheet_frame(new_report_file, 'Team Member Performance')
+        raw_summary = scan_raw_data_sheet(new_report_file, chunk_size)
+        print(f"Read {raw_summary['rows']} rows from Raw Data sheet.")
 
         # --- Sync Departments ---
-        unique_departments = df_raw['Department'].dropna().unique()
+        unique_departments = raw_summary['departments']
         existing_depts = {d.dept_name for d in Department.query.all()}
         depts_added = 0
         for dept_name in unique_departments:
@@ -1650,14 +3520,11 @@ def import_data_command(yes, file, append):
                 db.session.add(Department(dept_name=dept_name))
                 depts_added += 1
         db.session.commit()
+        invalidate_catalogue()
         print(f"Departments synced ({depts_added} new added).")
 
         # --- Department mapping for user import ---
-        department_map = {}
-        if 'Team Member (First Last)' in df_raw.columns and 'Department' in df_raw.columns:
-            df_dept = df_raw[['Team Member (First Last)', 'Department']].dropna()
-            df_dept['Team Member (First Last)'] = df_dept['Team Member (First Last)'].str.strip()
-            department_map = df_dept.drop_duplicates('Team Member (First Last)', keep='first').set_index('Team Member (First Last)')['Department'].to_dict()
+        department_map = raw_summary['department_map']
 
         # --- Import Users ---
         df_baroda = df_performance[df_performance['Branch'] == 'Baroda'].copy() if 'Branch' in df_performance.columns else pd.DataFrame()
@@ -1732,63 +3599,43 @@ def import_data_command(yes, file, append):
                 print(f"[WARNING] Backup failed: {backup_err}. Aborting to protect data.")
                 return
             db.session.execute(text('DROP TABLE IF EXISTS log CASCADE;'))
+            # Zero the rollup rather than emptying it, so /chart-data clients see the dates the new file drops
+            LogDailyRollup.query.update(
+                {'log_count': 0, 'updated_at': datetime.utcnow(), 'change_seq': next_rollup_change()},
+                synchronize_session=False
+            )
             db.session.commit()
             db.create_all()
             print("Log table dropped and recreated.")
         else:
             existing_count = Log.query.count()
-            file_months = list(df_raw['Month'].dropna().unique()) if 'Month' in df_raw.columns else []
+            file_months = list(raw_summary['months'])
             existing_months = [m[0] for m in db.session.query(Log.month).distinct().all() if m[0]]
             overlap = set(file_months) & set(existing_months)
             if overlap:
-                print(f"[WARNING] Month(s) {list(overlap)} already in DB. Rows will be added on top.")
+                print(f"Month(s) {list(overlap)} already in DB. Rows already imported will be skipped.")
             print(f"Appending to {existing_count} existing log rows...")
 
-        # Build and insert log rows in batches
+        # Build and insert log rows in fixed-size chunks
         required_cols = ['Team Member (First Last)', 'Date (mm/dd/yy)', 'Function']
-        if not all(c in df_raw.columns for c in required_cols):
-            print(f"Error: Missing required columns. Found: {list(df_raw.columns)}")
+        if not all(c in raw_summary['columns'] for c in required_cols):
+            print(f"Error: Missing required columns. Found: {raw_summary['columns']}")
             return
 
-        df_raw_logs = df_raw.where(pd.notnull(df_raw), None)
-        logs_to_add = []
-        for _, row in df_raw_logs.iterrows():
-            if not row['Team Member (First Last)'] or not row['Date (mm/dd/yy)']:
-                continue
-            try:
-                log_date = pd.to_datetime(row['Date (mm/dd/yy)']).date()
-            except (ValueError, TypeError):
-                continue
-            logs_to_add.append(Log(
-                team_member=row.get('Team Member (First Last)'),
-                function=row.get('Function'),
-                date=log_date,
-                file_number=str(row.get('File  Number')) if row.get('File  Number') else None,
-                status=str(row.get('Status')) if pd.notna(row.get('Status')) else None,
-                tier1_escalation_reason=str(row.get('Escalation Reason')) if pd.notna(row.get('Escalation Reason')) else None,
-                im_escalation_reason=None,
-                department=row.get('Department'),
-                comments=None,
-                count=int(row.get('Count')) if row.get('Count') and str(row.get('Count')).isdigit() else 1,
-                bucket=row.get('Bucket'),
-                time=str(row.get('Time')) if row.get('Time') else None,
-                production_task=row.get('Production Task'),
-                month=row.get('Month')
-            ))
-
-        if logs_to_add:
-            batch_size = 500
-            total_imported = 0
-            for i in range(0, len(logs_to_add), batch_size):
-                batch = logs_to_add[i:i + batch_size]
-                db.session.bulk_save_objects(batch)
-                db.session.commit()
-                total_imported += len(batch)
-                print(f"  Batch {i // batch_size + 1}: {total_imported}/{len(logs_to_add)} rows committed...")
+        total_imported = load_raw_log_chunks(
+            iter_sheet_chunks(new_report_file, 'Raw Data', chunk_size),
+            skip_existing=append, total_rows=raw_summary['rows']
+        )
+        if not append:
+            # The dropped table took the In Progress guard index with it
+            ensure_in_progress_unique_index()
+            db.session.commit()
+        IMPORT_LAST_SUCCESS.set_to_current_time()
+        if total_imported:
             total_in_db = Log.query.count()
             print(f"\n--- Done: {total_imported} logs imported. Total in DB: {total_in_db} ---")
         else:
-            print("No valid log entries found to import.")
+            print("No new log entries found to import.")
 
     except Exception as e:
         db.session.rollback()
@@ -1807,8 +3654,61 @@ def count_rows_command():
     except Exception as e:
         print(f"An error occurred while counting rows: {e}")
 
-init_dashboard(app)
-init_daily_dashboard(app)
+# --- Lazy Analytics Dashboards ---
+
+# The Dash apps (and with them dash, plotly and pandas) are built on the first request
+# under their prefix rather than at import, so a restarted worker serves the login page
+# without paying for them. Each Dash app runs on its own internal Flask server; the
+# routes below check admin access on the main app and hand the request to it.
+DASHBOARD_FACTORIES = {
+    '/admin/analytics/': init_dashboard,
+    '/admin/daily_analytics/': init_daily_dashboard,
+}
+dashboard_servers = {}
+dashboard_lock = threading.Lock()
+
+def get_dashboard_server(prefix):
+    """Returns the Flask server running the Dash app for prefix, building it on first use."""
+    server = dashboard_servers.get(prefix)
+    if server is None:
+        with dashboard_lock:
+            server = dashboard_servers.get(prefix)
+            if server is None:
+                started = time.perf_counter()
+                server = DASHBOARD_FACTORIES[prefix](Flask(f"{__name__}.dashboard"))
+                dashboard_servers[prefix] = server
+                record_startup_timing(f"dashboard {prefix}", started)
+    return server
+
+def serve_dashboard(prefix):
+    return Response.from_app(get_dashboard_server(prefix).wsgi_app, request.environ)
+
+@app.route('/admin/analytics/', defaults={'path': ''}, methods=['GET', 'POST'])
+@app.route('/admin/analytics/<path:path>', methods=['GET', 'POST'])
+@csrf.exempt
+@admin_required
+def analytics_dashboard(path):
+    return serve_dashboard('/admin/analytics/')
+
+@app.route('/admin/daily_analytics/', defaults={'path': ''}, methods=['GET', 'POST'])
+@app.route('/admin/daily_analytics/<path:path>', methods=['GET', 'POST'])
+@csrf.exempt
+@admin_required
+def daily_analytics_dashboard(path):
+    return serve_dashboard('/admin/daily_analytics/')
+
+@app.cli.command("startup-report")
+def startup_report_command():
+    """Prints how long each startup phase took in this process."""
+    started = time.perf_counter()
+    for prefix in DASHBOARD_FACTORIES:
+        get_dashboard_server(prefix)
+    record_startup_timing('all dashboards', started)
+    print("\n--- Startup Timings ---")
+    for phase, seconds in startup_timings.items():
+        print(f"{phase:<34} {seconds:7.3f}s")
+    print("(dashboards are built on first request, so they are not part of worker boot)")
+    print("-----------------------\n")
 
 @app.cli.command("audit-dependencies")
 def audit_dependencies():
@@ -1847,10 +3747,16 @@ def audit_dependencies():
     print("Error: Neither 'pip-audit' nor 'safety' is installed.")
     print("To install, run: pip install pip-audit   OR   pip install safety")
 
+record_startup_timing('total boot', STARTUP_STARTED)
+
 if __name__ == '__main__':
     print(f"Template folder set to: {os.path.join(BASE_DIR, 'templates')}")
     debug_mode = os.environ.get('FLASK_DEBUG', 'False').lower() == 'true'
     port = int(os.environ.get("PORT", 5000))
 
+    # The local dev server brings its database up to date; deployments run `flask migrate`
+    with app.app_context():
+        apply_migrations()
+
     # Use the dynamic port and bind to 0.0.0.0
     app.run(host="0.0.0.0", port=port, debug=debug_mode)
@@ -0,0 +1,294 @@
+"""Benchmark harness for the tracker's hot routes.
+
+Fills a scratch database with synthetic users and logs, then times the main admin
+and employee routes through the Flask test client. This repeats for each table size
+given with --sizes. Each size reports p50/p95/p99 latency and sequential throughput
+per route, and the results are written as JSON so runs can be compared.
+
+    python benchmark.py --sizes 1000 10000 100000 --output benchmark_results.json
+
+Uses a temporary SQLite file by default. Set DATABASE_URL to benchmark a Postgres
+stand-in instead; the benchmark drops and recreates every table in that database.
+"""
+import os
+import sys
+import json
+import time
+import random
+import argparse
+import platform
+import statistics
+import tempfile
+import math
+from datetime import datetime, date, timedelta
+
+STATUSES = ['Completed', 'Approved', 'Rejected', 'Pending']
+ESCALATION_REASONS = [None, None, None, 'sample', 'other', 'missing documents']
+DEPARTMENTS = ['QC', 'Reports', 'Digital Operations', 'Underwriting', 'Compliance']
+PASSWORD = 'benchmark'
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000, 50000],
+                        help='Log table sizes to benchmark, in increasing order.')
+    parser.add_argument('--employees', type=int, default=50, help='Number of synthetic employees.')
+    parser.add_argument('--days', type=int, default=730, help='Spread logs over this many days before today.')
+    parser.add_argument('--requests', type=int, default=30, help='Timed requests per route and size.')
+    parser.add_argument('--warmup', type=int, default=2, help='Untimed requests per route before timing.')
+    parser.add_argument('--no-cache', action='store_true',
+                        help='Clear the dashboard cache before every request (measures cold aggregate cost).')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='benchmark_results.json', help='Where to write the JSON results.')
+    parser.add_argument('--dump-sample', metavar='PATH',
+                        help='Also write the first 100 generated logs to PATH in the data.json shape.')
+    return parser.parse_args()
+
+
+def generate_logs(count, employees, functions, days, rng, start_number=0):
+    """Yields `count` Log column dicts spread over employees, functions and the last `days` days."""
+    today = date.today()
+    for i in range(count):
+        member, department = rng.choice(employees)
+        function_name = rng.choice(functions)
+        log_date = today - timedelta(days=rng.randrange(days))
+        yield {
+            'team_member': member,
+            'function': function_name,
+            'date': log_date,
+            'file_number': str(start_number + i),
+            'status': rng.choice(STATUSES),
+            'tier1_escalation_reason': rng.choice(ESCALATION_REASONS),
+            'im_escalation_reason': rng.choice(ESCALATION_REASONS),
+            'department': department,
+            'comments': None,
+            'count': 1,
+            'bucket': function_name,
+            'time': None,
+            'production_task': None,
+            'month': log_date.strftime('%b-%y'),
+        }
+
+
+def as_sample_record(log):
+    """Converts a generated log to the shape of the records in data.json."""
+    return {
+        'Team Member': log['team_member'],
+        'Function': log['function'],
+        'Date': log['date'].isoformat(),
+        'File Number': log['file_number'],
+        'Status': log['status'],
+        'Tier 1 Escalation Reason': log['tier1_escalation_reason'] or '',
+        'IM Escalation Reason': log['im_escalation_reason'] or '',
+        'Department': log['department'],
+        'Comments': log['comments'] or '',
+    }
+
+
+def seed_reference_data(m, employee_count, rng):
+    """Creates the admin, employees, functions and departments. Returns (employees, functions)."""
+    from werkzeug.security import generate_password_hash
+
+    password_hash = generate_password_hash(PASSWORD)
+    m.db.session.add(m.User(username='admin', password=password_hash, role='admin', department='System'))
+    employees = [(f"employee{i:04d}", rng.choice(DEPARTMENTS)) for i in range(employee_count)]
+    for username, department in employees:
+        m.db.session.add(m.User(username=username, password=password_hash, role='employee', department=department))
+    for dept_name in DEPARTMENTS:
+        m.db.session.add(m.Department(dept_name=dept_name))
+    functions = [
+        "VI 3D Scan Pro", "VI 3D Desktop Pro", "Full Review", "Full Revision",
+        "Short Review", "Short Revision", "VI Second Review",
+        "Digital Operations - Sourcing", "Full Reports", "QCF (Underwriter Queue)",
+        "Full Review (CI Abridged)", "CMP Client Import", "Text Followup", "ACR",
+        "DNU Checklist Update", "PDC Compliance", "Meetings/Training"
+    ]
+    for function_name in functions:
+        m.db.session.add(m.Function(name=function_name))
+    m.db.session.commit()
+    return employees, functions
+
+
+def insert_logs(m, logs, batch_size=5000):
+    """Bulk-inserts generated logs and refreshes the daily rollup for their dates."""
+    from sqlalchemy import insert
+
+    batch = []
+    dates = set()
+    for log in logs:
+        batch.append(log)
+        dates.add(log['date'])
+        if len(batch) >= batch_size:
+            m.db.session.execute(insert(m.Log), batch)
+            batch = []
+    if batch:
+        m.db.session.execute(insert(m.Log), batch)
+    m.rebuild_log_rollup(dates=dates)
+    m.db.session.commit()
+    m.invalidate_dashboard_cache()
+
+
+def login(m, username):
+    client = m.app.test_client()
+    response = client.post('/login', data={'username': username, 'password': PASSWORD})
+    if response.status_code != 302:
+        raise RuntimeError(f"Login as {username} failed with status {response.status_code}")
+    return client
+
+
+def route_plan(employee, rng):
+    """(name, client role, method, url, form factory) for every benchmarked route."""
+    today = date.today()
+    month_start = today.replace(day=1)
+
+    def new_work_log():
+        return {'date': today.isoformat(), 'function': 'ACR', 'status': rng.choice(STATUSES), 'comments': 'benchmark'}
+
+    return [
+        ('admin_dashboard', 'admin', 'GET', '/admin/dashboard', None),
+        ('admin_summary', 'admin', 'GET', '/admin/summary', None),
+        ('analytics_layout', 'admin', 'GET', '/admin/analytics/_dash-layout', None),
+        ('daily_analytics_layout', 'admin', 'GET', '/admin/daily_analytics/_dash-layout', None),
+        ('production_report_month', 'admin', 'GET',
+         f'/admin/production_report?year={today.year}&month={today.month}', None),
+        ('production_report_year_by_month', 'admin', 'GET',
+         f'/admin/production_report?start={date(today.year - 1, 1, 1)}&end={today}&granularity=month', None),
+        ('production_by_department', 'admin', 'GET', '/admin/production_by_department', None),
+        ('tracker_employee', 'admin', 'GET', f'/admin/tracker?employee={employee}', None),
+        ('tracker_export_xlsx', 'admin', 'GET', f'/admin/tracker/export?employee={employee}', None),
+        ('tracker_export_csv', 'admin', 'GET', f'/admin/tracker/export?employee={employee}&format=csv', None),
+        ('chart_data', 'admin', 'GET', '/chart-data', None),
+        ('chart_data_columnar', 'admin', 'GET', '/chart-data?format=columnar', None),
+        ('chart_data_month', 'admin', 'GET', f'/chart-data?start={month_start}&end={today}', None),
+        ('view_employees', 'admin', 'GET', '/admin/view_employees', None),
+        ('team_member_performance', 'admin', 'GET', '/admin/team_member_performance', None),
+        ('employee_update_get', 'employee', 'GET', '/employee/update', None),
+        ('employee_summary', 'employee', 'GET', '/employee/summary', None),
+        ('employee_summary_year_by_month', 'employee', 'GET',
+         f'/employee/summary?start={date(today.year - 1, 1, 1)}&end={today}&by_month=1', None),
+        ('employee_update_post', 'employee', 'POST', '/employee/update', new_work_log),
+    ]
+
+
+def percentile(sorted_values, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    rank = math.ceil(fraction * len(sorted_values))
+    return sorted_values[max(rank, 1) - 1]
+
+
+def expected_response(method):
+    """(status, redirect target) a successful request returns: GETs render a page,
+    the work log POST redirects back to the form. Anything else, such as a lost
+    session redirecting to /login, counts as an error rather than a fast success."""
+    return (302, '/employee/update') if method == 'POST' else (200, None)
+
+
+def time_route(m, client, method, url, form_factory, requests, warmup, no_cache):
+    latencies = []
+    errors = 0
+    expected_status, expected_location = expected_response(method)
+    for i in range(warmup + requests):
+        if no_cache:
+            m.invalidate_dashboard_cache()
+        started = time.perf_counter()
+        if method == 'POST':
+            response = client.post(url, data=form_factory())
+        else:
+            response = client.get(url)
+        response.get_data()
+        elapsed = time.perf_counter() - started
+        if response.status_code != expected_status or (
+                expected_location and (response.location or '').split('?')[0] != expected_location):
+            errors += 1
+        if i >= warmup:
+            latencies.append(elapsed)
+    latencies.sort()
+    total = sum(latencies)
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 2),
+        'mean_ms': round(statistics.mean(latencies) * 1000, 2),
+        'throughput_rps': round(len(latencies) / total, 1) if total else None,
+    }
+
+
+def main():
+    args = parse_args()
+    sizes = sorted(set(args.sizes))
+    rng = random.Random(args.seed)
+
+    scratch_db = None
+    if not os.environ.get('DATABASE_URL'):
+        scratch_db = tempfile.NamedTemporaryFile(suffix='.db', delete=False)
+        scratch_db.close()
+        os.environ['DATABASE_URL'] = f"sqlite:///{scratch_db.name}"
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+    m = None
+    results = []
+    try:
+        import app as m
+
+        m.app.config['WTF_CSRF_ENABLED'] = False
+        with m.app.app_context():
+            m.db.drop_all()
+            m.apply_migrations()
+            database = m.db.engine.dialect.name
+            employees, functions = seed_reference_data(m, args.employees, rng)
+            clients = {'admin': login(m, 'admin'), 'employee': login(m, employees[0][0])}
+
+            if args.dump_sample:
+                sample = [as_sample_record(log) for log in generate_logs(100, employees, functions, args.days, random.Random(args.seed))]
+                with open(args.dump_sample, 'w') as f:
+                    json.dump(sample, f, indent=4)
+
+            current_size = 0
+            for size in sizes:
+                started = time.perf_counter()
+                insert_logs(m, generate_logs(size - current_size, employees, functions, args.days, rng, current_size))
+                current_size = size
+                print(f"\n--- {size:,} logs (seeded in {time.perf_counter() - started:.1f}s) ---")
+
+                for name, role, method, url, form_factory in route_plan(employees[0][0], rng):
+                    stats = time_route(m, clients[role], method, url, form_factory,
+                                       args.requests, args.warmup, args.no_cache)
+                    results.append({'size': size, 'route': name, 'method': method, 'url': url, **stats})
+                    print(f"{name:<34} p50 {stats['p50_ms']:>9.2f}ms  p95 {stats['p95_ms']:>9.2f}ms  "
+                          f"p99 {stats['p99_ms']:>9.2f}ms  {stats['throughput_rps'] or 0:>8.1f} req/s"
+                          f"{'  errors: ' + str(stats['errors']) if stats['errors'] else ''}")
+                # POSTs add logs; keep the next size's target exact
+                current_size = m.Log.query.count()
+
+        report = {
+            'meta': {
+                'timestamp': datetime.utcnow().isoformat() + 'Z',
+                'database': database,
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'employees': args.employees,
+                'days': args.days,
+                'requests_per_route': args.requests,
+                'warmup': args.warmup,
+                'dashboard_cache': not args.no_cache,
+                'seed': args.seed,
+            },
+            'results': results,
+        }
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nResults written to {args.output}")
+    finally:
+        if m is not None:
+            m.flush_system_alerts()
+            if scratch_db:
+                with m.app.app_context():
+                    m.db.engine.dispose()
+        if scratch_db:
+            os.remove(scratch_db.name)
+
+
+if __name__ == '__main__':
+    main()
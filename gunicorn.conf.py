@@ -0,0 +1,20 @@
+"""Gunicorn settings, read automatically when gunicorn starts in this folder."""
+import os
+import shutil
+
+# Shared store for the Prometheus multiprocess collectors (see "Prometheus Metrics" in app.py).
+# Set here so the master and every worker agree on the directory.
+METRICS_DIR = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'metrics_store')
+)
+
+
+def on_starting(server):
+    # Values from a previous server run would otherwise be merged into /metrics
+    shutil.rmtree(METRICS_DIR, ignore_errors=True)
+    os.makedirs(METRICS_DIR, exist_ok=True)
+
+
+def child_exit(server, worker):
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
@@ -0,0 +1,22 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+# The app reads DATABASE_URL at import, so this must run before any test module
+# imports it. Always a throwaway SQLite file: the fixture below drops every table.
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'tests.db')}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import app as m  # noqa: E402
+
+
+@pytest.fixture
+def app_context():
+    with m.app.app_context():
+        m.db.drop_all()
+        m.apply_migrations()
+        m.invalidate_catalogue()
+        yield
+        m.db.session.remove()
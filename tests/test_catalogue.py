@@ -0,0 +1,36 @@
+from sqlalchemy import event
+
+import app as m
+
+
+def count_statements(fn):
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(m.db.engine, 'before_cursor_execute', record)
+    try:
+        result = fn()
+    finally:
+        event.remove(m.db.engine, 'before_cursor_execute', record)
+    return result, len(statements)
+
+
+def test_catalogue_reads_within_the_check_interval_cost_no_queries(app_context):
+    m.db.session.add(m.Function(name='Review'))
+    m.db.session.commit()
+    m.invalidate_catalogue()
+
+    names, first = count_statements(m.function_names)
+    assert names == ['Review'] and first > 0
+    _, repeat = count_statements(lambda: (m.function_names(), m.department_names(), m.catalogue()))
+    assert repeat == 0
+
+
+def test_invalidate_catalogue_is_seen_at_once_in_this_process(app_context):
+    assert m.function_names() == []
+    m.db.session.add(m.Function(name='Audit'))
+    m.db.session.commit()
+    m.invalidate_catalogue()
+    assert m.function_names() == ['Audit']
@@ -0,0 +1,67 @@
+from datetime import date, datetime
+
+import pytest
+
+import app as m
+
+
+@pytest.fixture
+def admin_client(app_context):
+    m.db.session.add(m.Function(name='Review'))
+    m.db.session.commit()
+    m.invalidate_catalogue()
+    client = m.app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = 'admin'
+        session['role'] = 'admin'
+    return client
+
+
+def write(log_date, delta):
+    m.adjust_log_rollup((log_date, 'Alice Smith', 'Ops', 'Review', 'Completed'), delta)
+    m.db.session.commit()
+
+
+def test_since_cursor_returns_backdated_and_emptied_dates(admin_client):
+    write(date(2024, 5, 1), 2)
+    write(date(2024, 5, 20), 1)
+    write(date(2024, 5, 31), 1)
+    first = admin_client.get('/chart-data')
+    assert [row['Date'] for row in first.get_json()] == ['2024-05-01', '2024-05-20', '2024-05-31']
+    cursor = first.headers['X-Chart-Data-Cursor']
+
+    write(date(2024, 5, 1), 1)    # backdated entry
+    write(date(2024, 5, 20), -1)  # last log of the day moved away
+    changed = admin_client.get('/chart-data', query_string={'since': cursor})
+    assert {row['Date']: row['Review'] for row in changed.get_json()} == {'2024-05-01': 3, '2024-05-20': 0}
+
+    unchanged = admin_client.get('/chart-data', query_string={'since': changed.headers['X-Chart-Data-Cursor']})
+    assert unchanged.get_json() == []
+    assert [row['Date'] for row in admin_client.get('/chart-data').get_json()] == ['2024-05-01', '2024-05-31']
+
+
+class LaggingClock(datetime):
+    @classmethod
+    def utcnow(cls):
+        return datetime(2000, 1, 1)
+
+
+def test_since_cursor_does_not_depend_on_the_writer_clock(admin_client, monkeypatch):
+    write(date(2024, 5, 1), 1)
+    cursor = admin_client.get('/chart-data').headers['X-Chart-Data-Cursor']
+
+    monkeypatch.setattr(m, 'datetime', LaggingClock)
+    write(date(2024, 5, 2), 1)
+    monkeypatch.undo()
+    changed = admin_client.get('/chart-data', query_string={'since': cursor})
+    assert [row['Date'] for row in changed.get_json()] == ['2024-05-02']
+
+
+def test_etag_changes_with_every_write(admin_client):
+    write(date(2024, 5, 1), 1)
+    first = admin_client.get('/chart-data')
+    assert 'Last-Modified' not in first.headers
+    assert admin_client.get('/chart-data', headers={'If-None-Match': first.headers['ETag']}).status_code == 304
+
+    write(date(2024, 5, 1), 1)
+    assert admin_client.get('/chart-data', headers={'If-None-Match': first.headers['ETag']}).status_code == 200
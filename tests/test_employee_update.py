@@ -0,0 +1,45 @@
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+import app as m
+
+
+@pytest.fixture
+def employee_client(app_context, monkeypatch):
+    monkeypatch.setitem(m.app.config, 'WTF_CSRF_ENABLED', False)
+    client = m.app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = 'Alice Smith'
+        session['role'] = 'employee'
+    return client
+
+
+def post_in_progress(client):
+    return client.post('/employee/update', data={
+        'date': '2024-05-01', 'function': 'Review', 'file_number': '1001', 'status': 'In Progress',
+    }, follow_redirects=True)
+
+
+def test_second_in_progress_log_is_a_recognised_conflict(app_context):
+    for _ in range(2):
+        m.db.session.add(m.Log(team_member='Alice Smith', status='In Progress'))
+    with pytest.raises(IntegrityError) as error:
+        m.db.session.flush()
+    m.db.session.rollback()
+    assert m.is_in_progress_conflict(error.value)
+
+
+def test_rollup_failure_is_not_reported_as_a_duplicate(employee_client, monkeypatch):
+    def fail(key, delta):
+        raise RuntimeError('rollup unavailable')
+
+    monkeypatch.setattr(m, 'adjust_log_rollup', fail)
+    page = post_in_progress(employee_client).get_data(as_text=True)
+    assert 'Error saving data: rollup unavailable' in page
+    assert 'duplicate' not in page
+    assert m.Log.query.count() == 0
+
+
+def test_in_progress_log_is_added(employee_client):
+    assert 'Work log added successfully!' in post_in_progress(employee_client).get_data(as_text=True)
+    assert m.Log.query.filter_by(status='In Progress').count() == 1
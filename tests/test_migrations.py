@@ -0,0 +1,47 @@
+from sqlalchemy import event
+
+import app as m
+
+
+def count_statements(fn):
+    statements = []
+
+    def record(*args):
+        statements.append(args[2])
+
+    event.listen(m.db.engine, 'before_cursor_execute', record)
+    try:
+        fn()
+    finally:
+        event.remove(m.db.engine, 'before_cursor_execute', record)
+    return statements
+
+
+def in_progress_index_exists():
+    return m.db.session.execute(m.text(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'uq_log_team_member_in_progress'"
+    )).first() is not None
+
+
+def test_migrate_on_a_current_schema_reads_the_version_and_pending_steps_only(app_context):
+    assert len(count_statements(m.apply_migrations)) == 2
+
+
+def test_skipped_in_progress_index_is_retried_until_created(app_context):
+    m.db.session.execute(m.text('DROP INDEX uq_log_team_member_in_progress'))
+    for _ in range(2):
+        m.db.session.add(m.Log(team_member='Alice Smith', status='In Progress'))
+    m.db.session.commit()
+    assert m.ensure_in_progress_unique_index() is False
+    m.db.session.commit()
+
+    m.apply_migrations()
+    assert not in_progress_index_exists()
+    assert m.PendingSchemaStep.query.count() == 1
+
+    m.Log.query.filter_by(team_member='Alice Smith').first().status = 'Completed'
+    m.db.session.commit()
+    m.apply_migrations()
+    assert in_progress_index_exists()
+    assert m.PendingSchemaStep.query.count() == 0
+    assert len(count_statements(m.apply_migrations)) == 2
@@ -0,0 +1,31 @@
+import pytest
+
+import app as m
+
+
+@pytest.fixture
+def admin_client(app_context):
+    client = m.app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = 'admin'
+        session['role'] = 'admin'
+    return client
+
+
+@pytest.mark.parametrize('query', [
+    {'start': '2020-01-01', 'end': '9999-12-31', 'granularity': 'month'},
+    {'start': '1600-01-01', 'end': '2020-01-01', 'granularity': 'day'},
+    {'start': '9999-12-01', 'end': '9999-12-31', 'granularity': 'month'},
+])
+def test_out_of_range_report_is_refused_with_a_message(admin_client, query):
+    response = admin_client.get('/admin/production_report', query_string=query)
+    assert response.status_code == 200
+    assert b'Date range' in response.data
+    assert len(response.data) < 200_000
+
+
+def test_range_report_within_the_limit(admin_client):
+    response = admin_client.get('/admin/production_report',
+                                query_string={'start': '2024-01-01', 'end': '2024-12-31', 'granularity': 'week'})
+    assert response.status_code == 200
+    assert b'Production by Week' in response.data
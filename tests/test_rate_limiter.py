@@ -0,0 +1,46 @@
+from sqlalchemy.orm import Query
+
+import app as m
+
+
+def miss_first_update(monkeypatch):
+    """Makes the next UPDATE report no rows, as if another worker inserted the
+    counter row right after it ran; the INSERT then hits uq_rate_limit_counter_window."""
+    original_update = Query.update
+    calls = []
+
+    def update(self, *args, **kwargs):
+        calls.append(1)
+        return 0 if len(calls) == 1 else original_update(self, *args, **kwargs)
+
+    monkeypatch.setattr(Query, 'update', update)
+
+
+def counts(key):
+    return [c.count for c in m.RateLimitCounter.query.filter_by(key=key).all()]
+
+
+def test_hit_counts_attempts_in_the_current_window(app_context):
+    limiter = m.DatabaseRateLimiter()
+    for _ in range(3):
+        limiter.hit('10.0.0.1', 60)
+    assert counts('10.0.0.1') == [3]
+    assert limiter.estimate('10.0.0.1', 60) >= 3
+
+
+def test_hit_counts_against_row_created_by_another_worker(app_context, monkeypatch):
+    limiter = m.DatabaseRateLimiter()
+    limiter.hit('10.0.0.2', 60)
+    miss_first_update(monkeypatch)
+    limiter.hit('10.0.0.2', 60)
+    monkeypatch.undo()
+    assert counts('10.0.0.2') == [2]
+
+
+def test_record_attempt_counts_after_insert_conflict(app_context, monkeypatch):
+    monkeypatch.setattr(m, 'rate_limiter', m.DatabaseRateLimiter())
+    m.record_attempt('10.0.0.3')
+    miss_first_update(monkeypatch)
+    m.record_attempt('10.0.0.3')
+    monkeypatch.undo()
+    assert counts('10.0.0.3') == [2]
@@ -0,0 +1,22 @@
+from datetime import date
+
+import app as m
+
+
+def test_team_member_performance_averages_all_logs_over_active_days(app_context):
+    m.db.session.add(m.User(username='Alice Smith', password='x', role='employee'))
+    for log_date in [date(2024, 5, 1), date(2024, 5, 1), date(2024, 5, 2), None]:
+        m.db.session.add(m.Log(team_member='Alice Smith', function='Review', date=log_date))
+    m.db.session.commit()
+    m.rebuild_log_rollup()
+    m.db.session.commit()
+
+    client = m.app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = 'admin'
+        session['role'] = 'admin'
+    captured = []
+    with m.template_rendered.connected_to(lambda sender, template, context, **extra: captured.append(context)):
+        assert client.get('/admin/team_member_performance').status_code == 200
+    (row,) = captured[0]['performance_data']
+    assert (row['total_logs'], row['active_days'], row['avg_per_day']) == (4, 2, 2.0)
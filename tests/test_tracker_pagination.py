@@ -0,0 +1,59 @@
+from datetime import date
+
+import app as m
+
+
+def add_logs():
+    dates = [date(2024, 5, 1), None, date(2024, 5, 3), date(2024, 5, 1), None, date(2024, 5, 2), date(2024, 5, 3)]
+    for log_date in dates:
+        m.db.session.add(m.Log(team_member='Alice Smith', function='Review', date=log_date))
+    m.db.session.commit()
+    logs = m.Log.query.all()
+    # Tracker order: date DESC NULLS LAST, id DESC
+    return [log.id for log in sorted(logs, key=lambda l: (l.date is None, -(l.date.toordinal() if l.date else 0), -l.id))]
+
+
+def test_keyset_pages_walk_dated_then_undated_rows_both_ways(app_context):
+    expected = add_logs()
+
+    pages, cursor = [], None
+    while True:
+        logs, _, has_older = m.fetch_tracker_page([], after=cursor, limit=2)
+        pages.append([log.id for log in logs])
+        if not has_older:
+            break
+        cursor = (logs[-1].date, logs[-1].id)
+    assert [i for page in pages for i in page] == expected
+
+    # Walk back from the last page to the first
+    logs, has_newer, _ = m.fetch_tracker_page([], after=cursor, limit=2)
+    back = [[log.id for log in logs]]
+    while has_newer:
+        logs, has_newer, _ = m.fetch_tracker_page([], before=(logs[0].date, logs[0].id), limit=2)
+        back.append([log.id for log in logs])
+    assert back[::-1] == pages
+
+
+def admin_client():
+    client = m.app.test_client()
+    with client.session_transaction() as session:
+        session['user'] = 'admin'; session['role'] = 'admin'
+    return client
+
+
+def test_tracker_links_keep_the_cursor_when_its_rows_are_deleted(app_context):
+    expected = add_logs()
+    oldest = m.db.session.get(m.Log, expected[-1])
+    cursor = m.encode_log_cursor(oldest)
+    m.db.session.delete(oldest)
+    m.db.session.commit()
+
+    # Previous from a page whose first row was deleted still seeks from its values
+    response = admin_client().get('/admin/tracker', query_string={'before': cursor, 'page': 2})
+    assert response.status_code == 200
+    assert b'removed since it was opened' not in response.data
+
+    # Nothing is left past the cursor: warn, and link back from the cursor itself
+    response = admin_client().get('/admin/tracker', query_string={'after': cursor, 'page': 2})
+    assert b'removed since it was opened' in response.data
+    assert f'before={cursor}'.encode() in response.data